@@ -0,0 +1,51 @@
+"""
+Benchmark de DatabaseManager.bulk_update: marcar N lembretes vencidos como enviados
+com um UPDATE por linha (como antes de user-008) e com um único bulk_update.
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.bench_bulk_update [--linhas 10000]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.comum import PERFIS, usar_perfil
+from database import init_database, DatabaseManager
+
+async def main(linhas, perfil):
+    usar_perfil(perfil)
+    await init_database()
+    await DatabaseManager.open_pool()
+    await DatabaseManager.start_writer()
+
+    await DatabaseManager.execute_transaction([(
+        "INSERT INTO reminders (user_id, channel_id, message, remind_at) VALUES (?, ?, ?, ?)",
+        [(i, 1, 'lembrete', 0) for i in range(2 * linhas)],
+        True
+    )])
+
+    # Antes: uma escrita por lembrete vencido
+    inicio = time.perf_counter()
+    for lembrete_id in range(1, linhas + 1):
+        await DatabaseManager.execute_query("UPDATE reminders SET is_sent = 1 WHERE id = ?", (lembrete_id,))
+    individual = time.perf_counter() - inicio
+
+    # Depois: uma transação com UPDATE ... WHERE id IN (...) em blocos
+    inicio = time.perf_counter()
+    resultado = await DatabaseManager.bulk_update('reminders', 'is_sent = 1', ids=range(linhas + 1, 2 * linhas + 1))
+    em_lote = time.perf_counter() - inicio
+
+    (marcados,) = await DatabaseManager.fetch_one("SELECT COUNT(*) FROM reminders WHERE is_sent = 1")
+    await DatabaseManager.stop_writer()
+    await DatabaseManager.close_pool()
+
+    print(f"{linhas} lembretes vencidos por rodada, perfil {perfil} ({marcados} marcados)")
+    print(f"UPDATE por linha: {individual:.3f}s")
+    print(f"bulk_update:      {em_lote:.3f}s ({resultado.rowcount} linhas, {individual / em_lote:.0f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default='wal')
+    args = parser.parse_args()
+    asyncio.run(main(args.linhas, args.perfil))
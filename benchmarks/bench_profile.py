@@ -0,0 +1,72 @@
+"""
+Benchmark do perfil de armazenamento (DB_PROFILE): vazão de escritas concorrentes
+e latência de uma leitura no estilo de /minhas_tarefas enquanto as escritas rodam,
+com o perfil WAL/NORMAL do bot e com o padrão DELETE/FULL do SQLite.
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.bench_profile [--escritores 20] [--leituras 200]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.comum import usar_perfil, apagar_banco
+from database import init_database, DatabaseManager
+
+LEITURA = '''SELECT id, title FROM tasks
+             WHERE user_id = ? AND guild_id = ? AND is_completed = 0'''
+ESCRITA = "INSERT INTO reminders (user_id, channel_id, message, remind_at) VALUES (?, ?, ?, ?)"
+
+async def rodada(perfil, escritores, leituras):
+    """Retorna (escritas/s, p50, p99 da leitura em ms) de uma rodada com o perfil"""
+    apagar_banco()
+    usar_perfil(perfil)
+    await init_database()
+    await DatabaseManager.open_pool()
+    await DatabaseManager.start_writer()
+
+    await DatabaseManager.execute_transaction([(
+        "INSERT INTO tasks (user_id, guild_id, title) VALUES (?, ?, ?)",
+        [(i % 50, 1, f"tarefa {i}") for i in range(5000)],
+        True
+    )])
+
+    parar = False
+    latencias = []
+
+    async def escritor(user_id):
+        escritas = 0
+        while not parar:
+            await DatabaseManager.execute_query(ESCRITA, (user_id, 1, 'x' * 200, 0))
+            escritas += 1
+        return escritas
+
+    tarefas = [asyncio.create_task(escritor(i)) for i in range(escritores)]
+    inicio = time.perf_counter()
+    for _ in range(leituras):
+        t = time.perf_counter()
+        await DatabaseManager.fetch_all(LEITURA, (7, 1))
+        latencias.append((time.perf_counter() - t) * 1000)
+    parar = True
+    escritas = sum(await asyncio.gather(*tarefas))
+    duracao = time.perf_counter() - inicio
+
+    await DatabaseManager.stop_writer()
+    await DatabaseManager.close_pool()
+
+    quantis = statistics.quantiles(latencias, n=100)
+    return escritas / duracao, quantis[49], quantis[98]
+
+async def main(escritores, leituras):
+    print(f"{escritores} escritores concorrentes, {leituras} leituras")
+    for perfil in ('padrao', 'wal'):
+        vazao, p50, p99 = await rodada(perfil, escritores, leituras)
+        print(f"{perfil:7s} {vazao:8.0f} escritas/s  leitura p50={p50:.2f}ms p99={p99:.2f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--escritores", type=int, default=20)
+    parser.add_argument("--leituras", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.escritores, args.leituras))
@@ -0,0 +1,54 @@
+"""
+Benchmark do escritor único (DatabaseWriter): escritas por segundo de N votos
+concorrentes (INSERT OR REPLACE INTO poll_votes) com um commit por escrita
+(pool de conexões, sem escritor) e com o commit em grupo do escritor.
+
+Uso, a partir da raiz do projeto:
+    python -m benchmarks.bench_writer [--escritas 2000] [--perfil wal|padrao]
+
+--perfil padrao usa o journal DELETE/FULL do SQLite, como antes de DB_PROFILE.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.comum import PERFIS, usar_perfil
+from database import init_database, DatabaseManager
+
+VOTO = "INSERT OR REPLACE INTO poll_votes (poll_id, user_id, option_index) VALUES (?, ?, ?)"
+
+async def votos_concorrentes(poll_id, escritas):
+    """Envia `escritas` votos ao mesmo tempo e retorna as escritas por segundo"""
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        DatabaseManager.execute_query(VOTO, (poll_id, user_id, user_id % 5))
+        for user_id in range(escritas)
+    ))
+    return escritas / (time.perf_counter() - inicio)
+
+async def main(escritas, perfil):
+    usar_perfil(perfil)
+    await init_database()
+    await DatabaseManager.open_pool()
+
+    # Antes: cada execute_query pega uma conexão do pool e faz o próprio commit
+    antes = await votos_concorrentes(1, escritas)
+
+    # Depois: as escritas vão para o escritor único e são gravadas em grupo
+    await DatabaseManager.start_writer()
+    depois = await votos_concorrentes(2, escritas)
+    await DatabaseManager.stop_writer()
+
+    total = await DatabaseManager.fetch_one("SELECT COUNT(*) FROM poll_votes")
+    await DatabaseManager.close_pool()
+
+    print(f"{escritas} votos concorrentes, perfil {perfil} ({total[0]} gravados)")
+    print(f"commit por escrita: {antes:8.0f} escritas/s")
+    print(f"escritor em grupo:  {depois:8.0f} escritas/s ({depois / antes:.1f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--escritas", type=int, default=2000)
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default='wal')
+    args = parser.parse_args()
+    asyncio.run(main(args.escritas, args.perfil))
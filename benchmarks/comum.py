@@ -0,0 +1,35 @@
+"""Preparação compartilhada pelos benchmarks (banco temporário e perfis de armazenamento)"""
+import os
+import sys
+import tempfile
+
+# O banco dos benchmarks é temporário e precisa ser definido antes de importar config
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+# Perfil padrão do SQLite, usado pelo bot antes de DB_PROFILE (journal em arquivo, fsync a cada commit)
+PERFIL_SQLITE_PADRAO = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'busy_timeout': 30000
+}
+
+PERFIS = {
+    'wal': dict(database.DB_PROFILE),
+    'padrao': PERFIL_SQLITE_PADRAO
+}
+
+def usar_perfil(nome):
+    """Troca o perfil aplicado por database.connect() a cada nova conexão"""
+    perfil = PERFIS[nome]
+    database.DB_PROFILE.clear()
+    database.DB_PROFILE.update(perfil)
+
+def apagar_banco():
+    """Remove o banco temporário (e os arquivos do WAL) entre as rodadas"""
+    for sufixo in ('', '-wal', '-shm', '-journal'):
+        caminho = database.DATABASE_PATH + sufixo
+        if os.path.exists(caminho):
+            os.remove(caminho)
@@ -1,36 +1,195 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
 import asyncio
-from database import DatabaseManager
-from config import EMOJIS, DEFAULT_COLOR
+import json
+import sqlite3
+import time
+from database import DatabaseManager, to_epoch, from_epoch, now_epoch
+from config import (
+    EMOJIS, DEFAULT_COLOR, COUNTDOWN_STARTUP_SPREAD, COUNTDOWN_FAILURE_BACKOFF, COUNTDOWN_MAX_FAILURES,
+    DISPATCH_RETRY_DELAY
+)
+from utils.helpers import truncate_text, EMBED_TITLE_LIMIT, EMBED_FIELD_NAME_LIMIT, EMBED_TOTAL_LIMIT
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Campos por embed aceitos pelo Discord e espaço reservado para o rodapé do quadro
+MAX_CAMPOS_QUADRO = 25
+RESERVA_RODAPE = 100
+
+# Plano de atualização pelo tempo restante:
+# (restante acima de, intervalo entre edições, descrição), em segundos
+PLANO_ATUALIZACAO = [
+    (7 * 86400, 86400, "diariamente"),   # Mais de uma semana: só os dias mudam
+    (86400, 3600, "a cada hora"),        # Mais de um dia: dias e horas
+    (3600, 300, "a cada 5 minutos"),     # Último dia: horas e minutos
+    (0, 60, "a cada minuto"),            # Última hora
+]
+
+def plano_atualizacao(restante):
+    """Faixa do plano de atualização para o tempo restante (em segundos)"""
+    for faixa in PLANO_ATUALIZACAO:
+        if restante > faixa[0]:
+            return faixa
+    return PLANO_ATUALIZACAO[-1]
+
+# Código de erro da API do Discord para canal inexistente
+CANAL_DESCONHECIDO = 10003
+
+def deslocamento(contador_id, janela):
+    """Fase fixa de um contador dentro de uma janela, para espalhar as edições"""
+    if janela <= 0:
+        return 0
+    return (contador_id * 2654435761) % janela
+
 class ContadoresCog(commands.Cog):
     """Sistema de contadores regressivos"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.atualizar_contadores.start()
+        # Assinatura do último embed enviado por contador, para pular edições sem mudança
+        self.assinaturas = {}
+        self.assinaturas_quadros = {}
+        # Cache negativo de canais sem acesso: channel_id -> (falhas seguidas, bloqueado até)
+        self.canais_com_falha = {}
+    
+    async def cog_load(self):
+        # Uma falha ao ler os contadores ativos impede o carregamento do cog, em vez de
+        # subir sem nada agendado (não há varredura periódica que os recupere)
+        contadores = await DatabaseManager.fetch_all(
+            "SELECT id, target_date, board_id FROM countdowns WHERE is_active = 1",
+            raise_errors=True
+        )
+        
+        # Quadros: o contador mais próximo define o ritmo de atualização
+        quadros = await DatabaseManager.fetch_all(
+            '''SELECT b.id, MIN(c.target_date)
+               FROM countdown_boards b
+               JOIN countdowns c ON c.board_id = b.id AND c.is_active = 1
+               WHERE b.is_active = 1
+               GROUP BY b.id''',
+            raise_errors=True
+        )
+        
+        self.bot.scheduler.register('countdown_refresh', self.atualizar_contadores)
+        self.bot.scheduler.register('countdown', self.finalizar_contadores)
+        self.bot.scheduler.register('countdown_board', self.atualizar_quadros)
+        
+        agora = now_epoch()
+        for contador_id, target_date, board_id in contadores:
+            # Finalização no horário exato do evento (os já vencidos disparam assim que o bot ficar pronto)
+            self.bot.scheduler.schedule('countdown', contador_id, target_date)
+            
+            # Contadores de quadro são atualizados junto com o quadro
+            if board_id is None:
+                self.agendar_primeira_atualizacao('countdown_refresh', contador_id, target_date, agora)
+        
+        for board_id, target_date in quadros:
+            self.agendar_primeira_atualizacao('countdown_board', board_id, target_date, agora)
+        
+        logger.info(f"{len(contadores)} contador(es) ativo(s) agendado(s), {len(quadros)} quadro(s)")
     
     def cog_unload(self):
-        self.atualizar_contadores.cancel()
+        self.bot.scheduler.unregister('countdown_refresh')
+        self.bot.scheduler.unregister('countdown')
+        self.bot.scheduler.unregister('countdown_board')
+    
+    def agendar_primeira_atualizacao(self, kind, item_id, target_date, agora):
+        """Após um reinício, espalha a primeira atualização em vez de editar tudo de uma vez"""
+        janela = min(plano_atualizacao(target_date - agora)[1], COUNTDOWN_STARTUP_SPREAD)
+        primeira = agora + deslocamento(item_id, janela)
+        if primeira < target_date:
+            self.bot.scheduler.schedule(kind, item_id, primeira)
+    
+    def proxima_atualizacao(self, item_id, target_date, agora):
+        """Instante da próxima edição conforme o plano de atualização (None se não houver)"""
+        limite, intervalo, _ = plano_atualizacao(target_date - agora)
+        
+        # Cada item tem uma fase fixa dentro de 10% do intervalo,
+        # sem passar da entrada na faixa seguinte
+        proxima = agora + intervalo + deslocamento(item_id, intervalo // 10)
+        proxima = min(proxima, target_date - limite)
+        
+        # No horário do evento quem age é a finalização agendada, não a atualização
+        return proxima if proxima < target_date else None
+    
+    def agendar_atualizacao(self, contador_id, target_date, agora=None):
+        """Agenda a próxima edição do contador conforme o plano de atualização"""
+        agora = now_epoch() if agora is None else agora
+        proxima = self.proxima_atualizacao(contador_id, target_date, agora)
+        if proxima is not None:
+            self.bot.scheduler.schedule('countdown_refresh', contador_id, proxima)
+    
+    def agendar_quadro(self, board_id, target_date, agora=None):
+        """Agenda a próxima edição do quadro pelo seu contador mais próximo"""
+        agora = now_epoch() if agora is None else agora
+        proxima = self.proxima_atualizacao(board_id, target_date, agora)
+        if proxima is not None:
+            self.bot.scheduler.schedule('countdown_board', board_id, proxima)
+    
+    def esquecer_contador(self, contador_id):
+        """Remove o contador do agendamento e das assinaturas em memória"""
+        self.bot.scheduler.cancel('countdown_refresh', contador_id)
+        self.bot.scheduler.cancel('countdown', contador_id)
+        self.assinaturas.pop(contador_id, None)
+    
+    def canal_bloqueado(self, channel_id):
+        """Indica se o canal falhou recentemente e deve ser pulado sem chamar a API"""
+        falha = self.canais_com_falha.get(channel_id)
+        return falha is not None and falha[1] > time.time()
+    
+    async def registrar_falha_canal(self, channel_id, motivo):
+        """Registra uma falha de acesso ao canal e desativa seus contadores após falhas seguidas"""
+        falhas = self.canais_com_falha.get(channel_id, (0, 0))[0] + 1
+        
+        if falhas < COUNTDOWN_MAX_FAILURES:
+            self.canais_com_falha[channel_id] = (falhas, time.time() + COUNTDOWN_FAILURE_BACKOFF)
+            logger.warning(f"Canal {channel_id} inacessível para contadores ({motivo}), tentativa {falhas}")
+            return
+        
+        self.canais_com_falha.pop(channel_id, None)
+        contadores = await DatabaseManager.fetch_all(
+            "SELECT id FROM countdowns WHERE channel_id = ? AND is_active = 1",
+            (channel_id,)
+        )
+        ids = [contador_id for (contador_id,) in contadores]
+        for contador_id in ids:
+            self.esquecer_contador(contador_id)
+        await DatabaseManager.bulk_update('countdowns', 'is_active = 0', ids=ids)
+        
+        quadros = await DatabaseManager.fetch_all(
+            "SELECT id FROM countdown_boards WHERE channel_id = ? AND is_active = 1",
+            (channel_id,)
+        )
+        for (board_id,) in quadros:
+            await self.desativar_quadro(board_id)
+        
+        logger.warning(f"{len(ids)} contador(es) do canal {channel_id} desativado(s) após {falhas} falhas ({motivo})")
+    
+    @staticmethod
+    def assinatura_embed(embed):
+        """Identifica o conteúdo visível do embed (o horário de atualização não conta)"""
+        dados = embed.to_dict()
+        dados.pop('timestamp', None)
+        return hash(json.dumps(dados, sort_keys=True))
     
     @app_commands.command(name="contador", description="Criar um contador regressivo")
     @app_commands.describe(
         titulo="Título do evento",
         data="Data do evento (DD/MM/AAAA)",
-        hora="Hora do evento (HH:MM, opcional)"
+        hora="Hora do evento (HH:MM, opcional)",
+        quadro="Mostrar no quadro de contadores do canal em vez de uma mensagem própria"
     )
     async def criar_contador(
         self,
         interaction: discord.Interaction,
         titulo: str,
         data: str,
-        hora: str = "00:00"
+        hora: str = "00:00",
+        quadro: bool = False
     ):
         """Cria um novo contador regressivo"""
         try:
@@ -52,6 +211,10 @@ class ContadoresCog(commands.Cog):
                 )
                 return
             
+            if quadro:
+                await self.adicionar_ao_quadro(interaction, titulo, to_epoch(target_datetime))
+                return
+            
             # Criar embed inicial do contador
             embed = self.criar_embed_contador(titulo, target_datetime)
             
@@ -59,7 +222,7 @@ class ContadoresCog(commands.Cog):
             message = await interaction.original_response()
             
             # Salvar no banco de dados
-            await DatabaseManager.execute_query(
+            cursor = await DatabaseManager.execute_query(
                 '''INSERT INTO countdowns (guild_id, channel_id, message_id, author_id, title, target_date)
                    VALUES (?, ?, ?, ?, ?, ?)''',
                 (
@@ -68,18 +231,89 @@ class ContadoresCog(commands.Cog):
                     message.id,
                     interaction.user.id,
                     titulo,
-                    target_datetime
+                    to_epoch(target_datetime)
                 )
             )
             
+            self.assinaturas[cursor.lastrowid] = self.assinatura_embed(embed)
+            self.agendar_atualizacao(cursor.lastrowid, to_epoch(target_datetime))
+            self.bot.scheduler.schedule('countdown', cursor.lastrowid, to_epoch(target_datetime))
+            
             logger.info(f"Contador criado por {interaction.user} para {target_datetime}")
             
         except Exception as e:
             logger.error(f"Erro ao criar contador: {e}")
+            mensagem = f"{EMOJIS['cross']} Erro ao criar contador: {str(e)}"
+            # A falha pode vir depois da resposta (ex.: ao gravar o contador já anunciado)
+            if interaction.response.is_done():
+                await interaction.followup.send(mensagem, ephemeral=True)
+            else:
+                await interaction.response.send_message(mensagem, ephemeral=True)
+    
+    async def adicionar_ao_quadro(self, interaction, titulo, target_date):
+        """Adiciona o contador ao quadro do canal, criando o quadro se ainda não existir"""
+        quadro = await DatabaseManager.fetch_one(
+            "SELECT id, message_id FROM countdown_boards WHERE channel_id = ? AND is_active = 1",
+            (interaction.channel_id,)
+        )
+        
+        if quadro:
+            board_id, message_id = quadro
             await interaction.response.send_message(
-                f"{EMOJIS['cross']} Erro ao criar contador: {str(e)}",
+                f"{EMOJIS['check']} Contador **{titulo}** adicionado ao quadro deste canal!",
                 ephemeral=True
             )
+        else:
+            embed = self.criar_embed_quadro([(titulo, target_date)])
+            await interaction.response.send_message(embed=embed)
+            message = await interaction.original_response()
+            
+            try:
+                cursor = await DatabaseManager.execute_query(
+                    "INSERT INTO countdown_boards (guild_id, channel_id, message_id) VALUES (?, ?, ?)",
+                    (interaction.guild_id, interaction.channel_id, message.id)
+                )
+            except sqlite3.IntegrityError:
+                # Outro /contador criou o quadro do canal ao mesmo tempo (índice único por canal):
+                # apagar a mensagem duplicada e usar o quadro que ficou
+                quadro = await DatabaseManager.fetch_one(
+                    "SELECT id, message_id FROM countdown_boards WHERE channel_id = ? AND is_active = 1",
+                    (interaction.channel_id,)
+                )
+                if not quadro:
+                    raise
+                await message.delete()
+                board_id, message_id = quadro
+                await interaction.followup.send(
+                    f"{EMOJIS['check']} Contador **{titulo}** adicionado ao quadro deste canal!",
+                    ephemeral=True
+                )
+            else:
+                board_id, message_id = cursor.lastrowid, message.id
+                self.assinaturas_quadros[board_id] = self.assinatura_embed(embed)
+        
+        cursor = await DatabaseManager.execute_query(
+            '''INSERT INTO countdowns (guild_id, channel_id, message_id, author_id, title, target_date, board_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            (
+                interaction.guild_id,
+                interaction.channel_id,
+                message_id,
+                interaction.user.id,
+                titulo,
+                target_date,
+                board_id
+            )
+        )
+        
+        self.bot.scheduler.schedule('countdown', cursor.lastrowid, target_date)
+        if quadro:
+            # Quadro existente: mostrar o novo contador na próxima volta do agendador
+            self.bot.scheduler.schedule('countdown_board', board_id, now_epoch())
+        else:
+            self.agendar_quadro(board_id, target_date)
+        
+        logger.info(f"Contador {cursor.lastrowid} adicionado ao quadro {board_id} por {interaction.user}")
     
     @app_commands.command(name="meus_contadores", description="Ver seus contadores ativos")
     async def meus_contadores(self, interaction: discord.Interaction):
@@ -109,11 +343,11 @@ class ContadoresCog(commands.Cog):
             )
             
             for i, (contador_id, titulo, target_date) in enumerate(contadores[:10], 1):
-                target_datetime = datetime.fromisoformat(target_date.replace('Z', '+00:00'))
+                target_datetime = from_epoch(target_date)
                 tempo_restante = self.calcular_tempo_restante(target_datetime)
                 
                 embed.add_field(
-                    name=f"{i}. {titulo} (ID: {contador_id})",
+                    name=truncate_text(f"{i}. {titulo}", EMBED_FIELD_NAME_LIMIT - 16) + f" (ID: {contador_id})",
                     value=f"**Data:** <t:{int(target_datetime.timestamp())}:F>\n"
                           f"**Tempo restante:** {tempo_restante}",
                     inline=False
@@ -136,25 +370,27 @@ class ContadoresCog(commands.Cog):
     async def parar_contador(self, interaction: discord.Interaction, contador_id: int):
         """Para um contador específico"""
         try:
-            # Verificar se o contador existe e pertence ao usuário
-            contador = await DatabaseManager.fetch_one(
-                '''SELECT title FROM countdowns 
-                   WHERE id = ? AND author_id = ? AND guild_id = ? AND is_active = 1''',
+            # Marcar como inativo se existir, estiver ativo e pertencer ao usuário
+            contadores = await DatabaseManager.execute_returning(
+                '''UPDATE countdowns SET is_active = 0
+                   WHERE id = ? AND author_id = ? AND guild_id = ? AND is_active = 1
+                   RETURNING title, board_id''',
                 (contador_id, interaction.user.id, interaction.guild_id)
             )
             
-            if not contador:
+            if not contadores:
                 await interaction.response.send_message(
                     f"{EMOJIS['cross']} Contador não encontrado ou você não é o autor!",
                     ephemeral=True
                 )
                 return
             
-            # Marcar como inativo
-            await DatabaseManager.execute_query(
-                "UPDATE countdowns SET is_active = 0 WHERE id = ?",
-                (contador_id,)
-            )
+            contador = contadores[0]
+            self.esquecer_contador(contador_id)
+            
+            # Tirar o contador do quadro
+            if contador[1] is not None:
+                self.bot.scheduler.schedule('countdown_board', contador[1], now_epoch())
             
             embed = discord.Embed(
                 title=f"{EMOJIS['check']} Contador Parado",
@@ -172,15 +408,16 @@ class ContadoresCog(commands.Cog):
                 ephemeral=True
             )
     
-    @tasks.loop(minutes=5)  # Atualizar a cada 5 minutos
-    async def atualizar_contadores(self):
-        """Task que atualiza os contadores regressivos"""
+    async def atualizar_contadores(self, contador_ids):
+        """Chamado pelo agendador com os contadores cuja próxima atualização venceu"""
         try:
-            # Buscar contadores ativos
+            placeholders = ', '.join('?' * len(contador_ids))
             contadores = await DatabaseManager.fetch_all(
-                '''SELECT id, guild_id, channel_id, message_id, title, target_date 
-                   FROM countdowns 
-                   WHERE is_active = 1'''
+                f'''SELECT id, guild_id, channel_id, message_id, title, target_date 
+                    FROM countdowns 
+                    WHERE id IN ({placeholders}) AND is_active = 1''',
+                contador_ids,
+                raise_errors=True
             )
             
             for contador in contadores:
@@ -188,51 +425,89 @@ class ContadoresCog(commands.Cog):
                 
         except Exception as e:
             logger.error(f"Erro ao atualizar contadores: {e}")
-    
-    @atualizar_contadores.before_loop
-    async def before_atualizar_contadores(self):
-        await self.bot.wait_until_ready()
+            # O agendador já removeu os ids: sem reagendar, os contadores parariam de ser editados
+            for contador_id in contador_ids:
+                self.bot.scheduler.schedule('countdown_refresh', contador_id, now_epoch() + DISPATCH_RETRY_DELAY)
     
     async def atualizar_contador_individual(self, contador_data):
         """Atualiza um contador individual"""
         try:
             contador_id, guild_id, channel_id, message_id, titulo, target_date = contador_data
             
-            # Buscar canal e mensagem
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                await self.desativar_contador(contador_id)
-                return
+            # Canal parcial: envios e edições usam só os IDs, sem depender do cache
+            channel = self.bot.get_partial_messageable(channel_id, guild_id=guild_id)
             
-            target_datetime = datetime.fromisoformat(target_date.replace('Z', '+00:00'))
+            target_datetime = from_epoch(target_date)
             
-            # Verificar se o evento já passou
+            # O evento chegou: a finalização agendada cuida do contador
             if target_datetime <= datetime.now():
-                await self.finalizar_contador(contador_id, channel, titulo)
+                return
+            
+            self.agendar_atualizacao(contador_id, target_date)
+            
+            # Criar novo embed e pular a edição se o conteúdo visível não mudou
+            embed = self.criar_embed_contador(titulo, target_datetime)
+            assinatura = self.assinatura_embed(embed)
+            if self.assinaturas.get(contador_id) == assinatura or self.canal_bloqueado(channel_id):
                 return
             
             try:
-                message = await channel.fetch_message(message_id)
-                
-                # Criar novo embed
-                embed = self.criar_embed_contador(titulo, target_datetime)
-                
-                # Atualizar mensagem
-                await message.edit(embed=embed)
+                # Atualizar mensagem sem buscá-la antes
+                await channel.get_partial_message(message_id).edit(embed=embed)
+                self.assinaturas[contador_id] = assinatura
+                self.canais_com_falha.pop(channel_id, None)
                 
-            except discord.NotFound:
-                # Mensagem foi deletada, desativar contador
-                await self.desativar_contador(contador_id)
+            except discord.NotFound as e:
+                if e.code == CANAL_DESCONHECIDO:
+                    await self.registrar_falha_canal(channel_id, "canal não encontrado")
+                else:
+                    # Mensagem foi deletada, desativar contador
+                    await self.desativar_contador(contador_id)
+            
+            except discord.Forbidden:
+                await self.registrar_falha_canal(channel_id, "sem permissão")
                 
         except Exception as e:
             logger.error(f"Erro ao atualizar contador individual: {e}")
     
+    async def finalizar_contadores(self, contador_ids):
+        """Chamado pelo agendador no horário exato dos eventos"""
+        try:
+            placeholders = ', '.join('?' * len(contador_ids))
+            contadores = await DatabaseManager.fetch_all(
+                f'''SELECT id, guild_id, channel_id, title, target_date, board_id
+                    FROM countdowns
+                    WHERE id IN ({placeholders}) AND is_active = 1''',
+                contador_ids,
+                raise_errors=True
+            )
+            
+            await self.bot.dispatcher.dispatch(
+                contadores,
+                lambda c: self.finalizar_contador(
+                    c[0], self.bot.get_partial_messageable(c[2], guild_id=c[1]), c[3]
+                ),
+                channel_of=lambda c: c[2],
+                due_of=lambda c: c[4],
+                label="contadores"
+            )
+            
+            # Tirar os contadores finalizados dos seus quadros
+            for board_id in {c[5] for c in contadores if c[5] is not None}:
+                self.bot.scheduler.schedule('countdown_board', board_id, now_epoch())
+            
+        except Exception as e:
+            logger.error(f"Erro ao finalizar contadores: {e}")
+            # O agendador já removeu os ids: tentar de novo (os já finalizados são ignorados na leitura)
+            for contador_id in contador_ids:
+                self.bot.scheduler.schedule('countdown', contador_id, now_epoch() + DISPATCH_RETRY_DELAY)
+    
     async def finalizar_contador(self, contador_id, channel, titulo):
         """Finaliza um contador quando o evento chega"""
         try:
             # Criar embed de evento finalizado
             embed = discord.Embed(
-                title=f"{EMOJIS['countdown']} {titulo}",
+                title=truncate_text(f"{EMOJIS['countdown']} {titulo}", EMBED_TITLE_LIMIT),
                 description="🎉 **O evento chegou!** 🎉",
                 color=0xffd700,  # Dourado
                 timestamp=datetime.now()
@@ -244,8 +519,19 @@ class ContadoresCog(commands.Cog):
                 inline=False
             )
             
-            # Enviar notificação
-            await channel.send("🎉 **EVENTO CHEGOU!** 🎉", embed=embed)
+            # Enviar notificação; se falhar, o contador continua ativo e a finalização é reagendada
+            try:
+                await channel.send("🎉 **EVENTO CHEGOU!** 🎉", embed=embed)
+            except (discord.Forbidden, discord.NotFound) as e:
+                # Canal sem acesso: nova tentativa após o backoff, até os contadores do canal serem desativados
+                self.bot.scheduler.schedule('countdown', contador_id, now_epoch() + COUNTDOWN_FAILURE_BACKOFF)
+                motivo = "sem permissão" if isinstance(e, discord.Forbidden) else "canal não encontrado"
+                await self.registrar_falha_canal(channel.id, motivo)
+                return
+            except Exception as e:
+                logger.error(f"Erro ao enviar finalização do contador {contador_id}: {e}")
+                self.bot.scheduler.schedule('countdown', contador_id, now_epoch() + DISPATCH_RETRY_DELAY)
+                return
             
             # Desativar contador
             await self.desativar_contador(contador_id)
@@ -255,8 +541,92 @@ class ContadoresCog(commands.Cog):
         except Exception as e:
             logger.error(f"Erro ao finalizar contador: {e}")
     
+    async def atualizar_quadros(self, board_ids):
+        """Chamado pelo agendador com os quadros cuja próxima atualização venceu"""
+        for board_id in board_ids:
+            await self.atualizar_quadro(board_id)
+    
+    async def atualizar_quadro(self, board_id):
+        """Atualiza todos os contadores de um quadro com uma única edição"""
+        try:
+            quadro = await DatabaseManager.fetch_one(
+                "SELECT guild_id, channel_id, message_id FROM countdown_boards WHERE id = ? AND is_active = 1",
+                (board_id,),
+                raise_errors=True
+            )
+            
+            if not quadro:
+                return
+            
+            guild_id, channel_id, message_id = quadro
+            
+            # Os contadores já vencidos saem do quadro (a finalização agendada cuida deles)
+            agora = now_epoch()
+            contadores = await DatabaseManager.fetch_all(
+                '''SELECT title, target_date FROM countdowns
+                   WHERE board_id = ? AND is_active = 1 AND target_date > ?
+                   ORDER BY target_date ASC''',
+                (board_id, agora),
+                raise_errors=True
+            )
+            
+            if contadores:
+                self.agendar_quadro(board_id, contadores[0][1], agora)
+            
+            embed = self.criar_embed_quadro(contadores)
+            assinatura = self.assinatura_embed(embed)
+            
+            if self.assinaturas_quadros.get(board_id) != assinatura and not self.canal_bloqueado(channel_id):
+                channel = self.bot.get_partial_messageable(channel_id, guild_id=guild_id)
+                try:
+                    await channel.get_partial_message(message_id).edit(embed=embed)
+                    self.assinaturas_quadros[board_id] = assinatura
+                    self.canais_com_falha.pop(channel_id, None)
+                    
+                except discord.NotFound as e:
+                    if e.code == CANAL_DESCONHECIDO:
+                        await self.registrar_falha_canal(channel_id, "canal não encontrado")
+                    else:
+                        # Mensagem do quadro foi deletada, desativar o quadro e seus contadores
+                        await self.desativar_quadro(board_id, com_contadores=True)
+                    return
+                
+                except discord.Forbidden:
+                    await self.registrar_falha_canal(channel_id, "sem permissão")
+                    return
+            
+            # Quadro vazio: o próximo contador do canal cria um quadro novo
+            if not contadores:
+                await self.desativar_quadro(board_id)
+                
+        except Exception as e:
+            logger.error(f"Erro ao atualizar quadro de contadores: {e}")
+            # Uma leitura falha não pode passar por quadro vazio (seria desativado com os
+            # contadores ainda ativos); o agendador já removeu o quadro, então tentar de novo
+            self.bot.scheduler.schedule('countdown_board', board_id, now_epoch() + DISPATCH_RETRY_DELAY)
+    
+    async def desativar_quadro(self, board_id, com_contadores=False):
+        """Desativa um quadro (e, opcionalmente, os contadores ainda ativos nele)"""
+        self.bot.scheduler.cancel('countdown_board', board_id)
+        self.assinaturas_quadros.pop(board_id, None)
+        
+        operacoes = [("UPDATE countdown_boards SET is_active = 0 WHERE id = ?", (board_id,), False)]
+        if com_contadores:
+            contadores = await DatabaseManager.fetch_all(
+                "SELECT id FROM countdowns WHERE board_id = ? AND is_active = 1",
+                (board_id,)
+            )
+            for (contador_id,) in contadores:
+                self.esquecer_contador(contador_id)
+            operacoes.append(
+                ("UPDATE countdowns SET is_active = 0 WHERE board_id = ? AND is_active = 1", (board_id,), False)
+            )
+        
+        await DatabaseManager.execute_transaction(operacoes)
+    
     async def desativar_contador(self, contador_id):
         """Desativa um contador"""
+        self.esquecer_contador(contador_id)
         await DatabaseManager.execute_query(
             "UPDATE countdowns SET is_active = 0 WHERE id = ?",
             (contador_id,)
@@ -264,10 +634,12 @@ class ContadoresCog(commands.Cog):
     
     def criar_embed_contador(self, titulo, target_datetime):
         """Cria embed do contador"""
-        tempo_restante = self.calcular_tempo_restante(target_datetime)
+        # O texto acompanha a frequência de atualização da faixa atual
+        limite, _, frequencia = plano_atualizacao((target_datetime - datetime.now()).total_seconds())
+        tempo_restante = self.calcular_tempo_restante(target_datetime, mostrar_horas=limite < PLANO_ATUALIZACAO[0][0])
         
         embed = discord.Embed(
-            title=f"{EMOJIS['countdown']} {titulo}",
+            title=truncate_text(f"{EMOJIS['countdown']} {titulo}", EMBED_TITLE_LIMIT),
             color=DEFAULT_COLOR,
             timestamp=datetime.now()
         )
@@ -302,11 +674,52 @@ class ContadoresCog(commands.Cog):
                 inline=False
             )
         
-        embed.set_footer(text="Atualizado automaticamente a cada 5 minutos")
+        embed.set_footer(text=f"Atualizado automaticamente {frequencia}")
+        
+        return embed
+    
+    def criar_embed_quadro(self, contadores):
+        """Cria o embed do quadro com os contadores (título, data) do canal"""
+        embed = discord.Embed(
+            title=f"{EMOJIS['countdown']} Contadores do Canal",
+            color=DEFAULT_COLOR,
+            timestamp=datetime.now()
+        )
+        
+        if not contadores:
+            embed.description = "Nenhum contador ativo neste quadro."
+            embed.set_footer(text="Quadro encerrado")
+            return embed
+        
+        agora = datetime.now()
+        mostrados = 0
+        for titulo, target_date in contadores[:MAX_CAMPOS_QUADRO]:
+            target_datetime = from_epoch(target_date)
+            limite = plano_atualizacao((target_datetime - agora).total_seconds())[0]
+            tempo_restante = self.calcular_tempo_restante(
+                target_datetime, mostrar_horas=limite < PLANO_ATUALIZACAO[0][0]
+            )
+            
+            nome = truncate_text(titulo, EMBED_FIELD_NAME_LIMIT)
+            valor = f"<t:{target_date}:F>\n⏰ **{tempo_restante}**"
+            
+            # Os títulos são livres: parar antes de passar do tamanho total de um embed
+            if len(embed) + len(nome) + len(valor) > EMBED_TOTAL_LIMIT - RESERVA_RODAPE:
+                break
+            
+            embed.add_field(name=nome, value=valor, inline=False)
+            mostrados += 1
+        
+        # O contador mais próximo define a frequência de atualização do quadro
+        frequencia = plano_atualizacao(contadores[0][1] - to_epoch(agora))[2]
+        rodape = f"Atualizado automaticamente {frequencia}"
+        if mostrados < len(contadores):
+            rodape += f" • Mostrando {mostrados} de {len(contadores)} contadores"
+        embed.set_footer(text=rodape)
         
         return embed
     
-    def calcular_tempo_restante(self, target_datetime):
+    def calcular_tempo_restante(self, target_datetime, mostrar_horas=True):
         """Calcula o tempo restante até o evento"""
         agora = datetime.now()
         
@@ -324,7 +737,7 @@ class ContadoresCog(commands.Cog):
         if dias > 0:
             partes.append(f"{dias} dia{'s' if dias != 1 else ''}")
         
-        if horas > 0:
+        if horas > 0 and (mostrar_horas or dias == 0):
             partes.append(f"{horas} hora{'s' if horas != 1 else ''}")
         
         if minutos > 0 and dias == 0:  # Só mostrar minutos se for menos de um dia
@@ -1,34 +1,262 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import json
-import asyncio
+import time
 from datetime import datetime, timedelta
-from database import DatabaseManager
-from config import EMOJIS, DEFAULT_COLOR, MAX_POLL_OPTIONS
+from database import DatabaseManager, to_epoch, now_epoch
+from config import (
+    EMOJIS, DEFAULT_COLOR, MAX_POLL_OPTIONS, POLL_VOTE_FLUSH_INTERVAL, POLL_EMBED_UPDATE_INTERVAL,
+    DISPATCH_RETRY_DELAY
+)
+from utils.helpers import (
+    create_progress_bar, truncate_text, fit_lengths, EMBED_TITLE_LIMIT, EMBED_FIELD_VALUE_LIMIT
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+class BotaoVoto(discord.ui.DynamicItem[discord.ui.Button], template=r'enquete:(?P<poll_id>\d+):(?P<indice>\d+)'):
+    """Botão persistente de voto; o custom_id identifica a enquete e a opção"""
+    
+    def __init__(self, poll_id, indice, label=None, emoji=None):
+        super().__init__(
+            discord.ui.Button(
+                label=label,
+                emoji=emoji,
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"enquete:{poll_id}:{indice}"
+            )
+        )
+        self.poll_id = poll_id
+        self.indice = indice
+    
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(int(match['poll_id']), int(match['indice']))
+    
+    async def callback(self, interaction):
+        cog = interaction.client.get_cog('EnquetesCog')
+        await cog.registrar_voto_botao(interaction, self.poll_id, self.indice)
+
 class EnquetesCog(commands.Cog):
     """Sistema de enquetes interativas"""
     
     def __init__(self, bot):
         self.bot = bot
         self.number_emojis = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', '🔟']
+        # Índice em memória das enquetes ativas: message_id -> dados da enquete
+        self.enquetes_ativas = {}
+        # Votos ainda não gravados: (poll_id, user_id) -> opção (None = voto removido)
+        self.votos_pendentes = {}
+        # Enquetes com votos ainda não refletidos na mensagem: message_id -> instante da primeira alteração
+        self.enquetes_alteradas = {}
+    
+    async def cog_load(self):
+        # Uma falha ao ler as enquetes ativas impede o carregamento do cog, em vez de
+        # subir com enquetes que nunca encerram e apurações zeradas
+        enquetes = await DatabaseManager.fetch_all(
+            '''SELECT id, message_id, channel_id, title, options, expires_at, author_id, vote_mode
+               FROM polls WHERE is_active = 1''',
+            raise_errors=True
+        )
+        for poll_id, message_id, channel_id, titulo, opcoes_json, expires_at, author_id, modo in enquetes:
+            enquete = self.montar_enquete(
+                poll_id, channel_id, titulo, json.loads(opcoes_json), expires_at, author_id, modo
+            )
+            self.indexar_enquete(message_id, enquete)
+        
+        logger.info(f"{len(enquetes)} enquete(s) ativa(s) carregada(s)")
+        
+        await self.reconstruir_apuracoes()
+        
+        self.bot.scheduler.register('poll', self.encerrar_enquetes_expiradas)
+        # Botões de voto continuam funcionando em enquetes criadas antes de um reinício
+        self.bot.add_dynamic_items(BotaoVoto)
+        
+        # Reagendar o encerramento das enquetes com prazo (sobrevive a reinícios)
+        for poll_id, _, _, _, _, expires_at, _, _ in enquetes:
+            if expires_at is not None:
+                self.bot.scheduler.schedule('poll', poll_id, expires_at)
+        
+        self.gravar_votos.start()
+        self.atualizar_mensagens.start()
+    
+    async def cog_unload(self):
+        self.bot.scheduler.unregister('poll')
+        self.bot.remove_dynamic_items(BotaoVoto)
+        self.atualizar_mensagens.cancel()
+        self.gravar_votos.cancel()
+        await self.gravar_votos_pendentes()
+    
+    def montar_enquete(self, poll_id, channel_id, titulo, opcoes, expires_at, author_id, modo='reactions', autor=None):
+        """Monta os dados em memória de uma enquete ativa"""
+        # Enquetes com botões não aceitam votos por reação
+        emojis = {}
+        if modo == 'reactions':
+            emojis = {emoji: i for i, emoji in enumerate(self.number_emojis[:len(opcoes)])}
+        
+        return {
+            'id': poll_id,
+            'message_id': None,
+            'channel_id': channel_id,
+            'titulo': titulo,
+            'opcoes': opcoes,
+            'duracao': f"Encerra <t:{expires_at}:R>" if expires_at else "Sem limite de tempo",
+            'author_id': author_id,
+            'autor': autor,
+            'modo': modo,
+            'emojis': emojis,
+            # Apuração em memória: user_id -> opção votada e total por opção
+            'votos': {},
+            'contagem': [0] * len(opcoes),
+            # Assinatura do último embed enviado, para pular edições sem mudança
+            'assinatura': None
+        }
+    
+    def indexar_enquete(self, message_id, enquete):
+        """Adiciona uma enquete ativa ao índice em memória"""
+        enquete['message_id'] = message_id
+        self.enquetes_ativas[message_id] = enquete
+    
+    def formatar_resultados(self, opcoes, votos):
+        """
+        Texto com a barra de progresso e a porcentagem de cada opção. Cabe sempre em um
+        campo de embed: os nomes mais longos são encurtados para caber as contagens.
+        """
+        total_votos = sum(votos)
+        
+        linhas = []
+        for i, votos_opcao in enumerate(votos):
+            porcentagem = (votos_opcao / total_votos * 100) if total_votos > 0 else 0
+            barra = create_progress_bar(votos_opcao, total_votos, 10)
+            linhas.append((
+                f"{self.number_emojis[i]} **",
+                f"**\n`{barra}` {votos_opcao} votos ({porcentagem:.1f}%)\n\n"
+            ))
+        
+        espaco = EMBED_FIELD_VALUE_LIMIT - sum(len(antes) + len(depois) for antes, depois in linhas)
+        limite = fit_lengths([len(opcao) for opcao in opcoes], espaco)
+        
+        texto = "".join(
+            antes + (opcao if limite is None else truncate_text(opcao, limite)) + depois
+            for (antes, depois), opcao in zip(linhas, opcoes)
+        )
+        return texto[:EMBED_FIELD_VALUE_LIMIT]
+    
+    def montar_embed_enquete(self, enquete, encerrada=False):
+        """Embed da mensagem da enquete com a contagem atual"""
+        embed = discord.Embed(
+            title=truncate_text(f"{EMOJIS['poll']} {enquete['titulo']}", EMBED_TITLE_LIMIT),
+            color=DEFAULT_COLOR
+        )
+        
+        embed.add_field(
+            name="Opções:",
+            value=self.formatar_resultados(enquete['opcoes'], enquete['contagem']),
+            inline=False
+        )
+        embed.add_field(name="Duração:", value="Encerrada" if encerrada else enquete['duracao'], inline=True)
+        embed.add_field(name="Votos:", value=str(sum(enquete['contagem'])), inline=True)
+        
+        # Após um reinício o nome do autor vem do cache de usuários, quando disponível
+        autor = enquete['autor']
+        if autor is None:
+            usuario = self.bot.get_user(enquete['author_id'])
+            autor = usuario.display_name if usuario else None
+        
+        if encerrada:
+            embed.set_footer(text="Enquete finalizada")
+        elif autor:
+            embed.set_footer(text=f"Criado por {autor}")
+        
+        return embed
+    
+    @staticmethod
+    def assinatura_embed(embed):
+        """Identifica o conteúdo renderizado de um embed"""
+        return hash(json.dumps(embed.to_dict(), sort_keys=True))
+    
+    def marcar_alterada(self, enquete):
+        """Marca a mensagem da enquete para a próxima rodada de edições"""
+        self.enquetes_alteradas.setdefault(enquete['message_id'], time.time())
+    
+    @tasks.loop(seconds=POLL_EMBED_UPDATE_INTERVAL)
+    async def atualizar_mensagens(self):
+        """Task que aplica, no máximo uma vez por intervalo, as edições pendentes das enquetes"""
+        alteradas, self.enquetes_alteradas = self.enquetes_alteradas, {}
+        
+        edicoes = []
+        for message_id, alterada_em in alteradas.items():
+            enquete = self.enquetes_ativas.get(message_id)
+            if enquete is None:
+                continue
+            
+            embed = self.montar_embed_enquete(enquete)
+            assinatura = self.assinatura_embed(embed)
+            # Votos que se anularam dentro do intervalo não geram edição
+            if assinatura == enquete['assinatura']:
+                continue
+            
+            edicoes.append((enquete, embed, assinatura, alterada_em))
+        
+        resultados = await self.bot.dispatcher.dispatch(
+            edicoes,
+            self.editar_mensagem_enquete,
+            channel_of=lambda edicao: edicao[0]['channel_id'],
+            due_of=lambda edicao: edicao[3],
+            label="atualizações de enquete"
+        )
+        
+        # Edições que falharam voltam para a próxima rodada; mensagem apagada ou sem
+        # permissão não se resolve sozinha e não é repetida
+        for (enquete, _, _, alterada_em), resultado in zip(edicoes, resultados):
+            if isinstance(resultado, Exception) and not isinstance(resultado, (discord.NotFound, discord.Forbidden)):
+                self.enquetes_alteradas.setdefault(enquete['message_id'], alterada_em)
+    
+    @atualizar_mensagens.before_loop
+    async def before_atualizar_mensagens(self):
+        await self.bot.wait_until_ready()
+    
+    async def editar_mensagem_enquete(self, edicao):
+        """Edita a mensagem da enquete sem buscá-la (mensagem parcial)"""
+        enquete, embed, assinatura, _ = edicao
+        
+        # A enquete pode ter sido encerrada enquanto aguardava a vez
+        if self.enquetes_ativas.get(enquete['message_id']) is not enquete:
+            return
+        
+        message = self.bot.get_partial_messageable(enquete['channel_id']).get_partial_message(
+            enquete['message_id']
+        )
+        await message.edit(embed=embed)
+        enquete['assinatura'] = assinatura
+    
+    def criar_view_votacao(self, poll_id, opcoes):
+        """Cria a view persistente com um botão por opção"""
+        view = discord.ui.View(timeout=None)
+        for i, opcao in enumerate(opcoes):
+            view.add_item(BotaoVoto(poll_id, i, label=opcao[:80], emoji=self.number_emojis[i]))
+        return view
     
     @app_commands.command(name="enquete", description="Criar uma enquete interativa")
     @app_commands.describe(
         titulo="Título da enquete",
         opcoes="Opções separadas por | (até 10 opções)",
-        duracao="Duração em minutos (opcional, padrão: sem limite)"
+        duracao="Duração em minutos (opcional, padrão: sem limite)",
+        modo="Forma de votação (padrão: botões)"
     )
+    @app_commands.choices(modo=[
+        app_commands.Choice(name="🔘 Botões", value="buttons"),
+        app_commands.Choice(name="1️⃣ Reações", value="reactions")
+    ])
     async def criar_enquete(
         self, 
         interaction: discord.Interaction, 
         titulo: str, 
         opcoes: str,
-        duracao: int = None
+        duracao: int = None,
+        modo: str = "buttons"
     ):
         """Cria uma nova enquete"""
         try:
@@ -51,57 +279,72 @@ class EnquetesCog(commands.Cog):
             
             # Calcular data de expiração
             expires_at = None
-            duracao_texto = "Sem limite de tempo"
             
             if duracao:
                 expires_at = datetime.now() + timedelta(minutes=duracao)
-                duracao_texto = f"{duracao} minutos"
             
-            # Criar embed da enquete
-            embed = discord.Embed(
-                title=f"{EMOJIS['poll']} {titulo}",
-                color=DEFAULT_COLOR,
-                timestamp=datetime.now()
-            )
-            
-            # Adicionar opções ao embed
-            opcoes_texto = ""
-            for i, opcao in enumerate(lista_opcoes):
-                opcoes_texto += f"{self.number_emojis[i]} {opcao}\n"
-            
-            embed.add_field(name="Opções:", value=opcoes_texto, inline=False)
-            embed.add_field(name="Duração:", value=duracao_texto, inline=True)
-            embed.add_field(name="Votos:", value="0", inline=True)
-            embed.set_footer(text=f"Criado por {interaction.user.display_name}")
-            
-            await interaction.response.send_message(embed=embed)
-            message = await interaction.original_response()
-            
-            # Adicionar reações
-            for i in range(len(lista_opcoes)):
-                await message.add_reaction(self.number_emojis[i])
-            
-            # Salvar no banco de dados
-            await DatabaseManager.execute_query(
-                '''INSERT INTO polls (guild_id, channel_id, message_id, author_id, title, options, expires_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            # Salvar no banco de dados (o ID da enquete vai no custom_id dos botões;
+            # o ID da mensagem é preenchido após o envio)
+            cursor = await DatabaseManager.execute_query(
+                '''INSERT INTO polls (guild_id, channel_id, message_id, author_id, title, options, expires_at, vote_mode)
+                   VALUES (?, ?, 0, ?, ?, ?, ?, ?)''',
                 (
                     interaction.guild_id,
                     interaction.channel_id,
-                    message.id,
                     interaction.user.id,
                     titulo,
                     json.dumps(lista_opcoes),
-                    expires_at
+                    to_epoch(expires_at),
+                    modo
                 )
             )
+            poll_id = cursor.lastrowid
             
-            logger.info(f"Enquete criada por {interaction.user} no servidor {interaction.guild.name}")
+            # Criar embed da enquete (o mesmo usado nas atualizações de contagem)
+            enquete = self.montar_enquete(
+                poll_id,
+                interaction.channel_id,
+                titulo,
+                lista_opcoes,
+                to_epoch(expires_at),
+                interaction.user.id,
+                modo,
+                autor=interaction.user.display_name
+            )
+            embed = self.montar_embed_enquete(enquete)
+            enquete['assinatura'] = self.assinatura_embed(embed)
+            
+            try:
+                if modo == 'buttons':
+                    view = self.criar_view_votacao(poll_id, lista_opcoes)
+                    await interaction.response.send_message(embed=embed, view=view)
+                else:
+                    await interaction.response.send_message(embed=embed)
+                message = await interaction.original_response()
+            except Exception:
+                await DatabaseManager.execute_query(
+                    "UPDATE polls SET is_active = 0 WHERE id = ?",
+                    (poll_id,)
+                )
+                raise
+            
+            await DatabaseManager.execute_query(
+                "UPDATE polls SET message_id = ? WHERE id = ?",
+                (message.id, poll_id)
+            )
+            
+            self.indexar_enquete(message.id, enquete)
+            
+            # Adicionar reações
+            if modo == 'reactions':
+                for i in range(len(lista_opcoes)):
+                    await message.add_reaction(self.number_emojis[i])
             
             # Agendar fechamento automático se houver duração
-            if duracao:
-                await asyncio.sleep(duracao * 60)
-                await self.fechar_enquete_automaticamente(message.id)
+            if expires_at:
+                self.bot.scheduler.schedule('poll', poll_id, to_epoch(expires_at))
+            
+            logger.info(f"Enquete criada por {interaction.user} no servidor {interaction.guild.name}")
                 
         except Exception as e:
             logger.error(f"Erro ao criar enquete: {e}")
@@ -138,6 +381,7 @@ class EnquetesCog(commands.Cog):
                 )
                 return
             
+            self.bot.scheduler.cancel('poll', poll_data[0])
             await self.finalizar_enquete(msg_id, interaction.channel)
             await interaction.response.send_message(
                 f"{EMOJIS['check']} Enquete finalizada com sucesso!",
@@ -156,125 +400,259 @@ class EnquetesCog(commands.Cog):
                 ephemeral=True
             )
     
-    async def fechar_enquete_automaticamente(self, message_id):
-        """Fecha uma enquete automaticamente após o tempo limite"""
+    async def encerrar_enquetes_expiradas(self, poll_ids):
+        """Chamado pelo agendador com as enquetes cujo prazo terminou"""
         try:
-            # Buscar o canal da enquete
-            poll_data = await DatabaseManager.fetch_one(
-                "SELECT channel_id FROM polls WHERE message_id = ? AND is_active = 1",
-                (message_id,)
+            placeholders = ', '.join('?' * len(poll_ids))
+            enquetes = await DatabaseManager.fetch_all(
+                f'''SELECT id, channel_id, message_id FROM polls
+                    WHERE id IN ({placeholders}) AND is_active = 1''',
+                poll_ids,
+                raise_errors=True
             )
             
-            if poll_data:
-                channel = self.bot.get_channel(poll_data[0])
+            sem_canal = []
+            for poll_id, channel_id, message_id in enquetes:
+                channel = self.bot.get_channel(channel_id)
                 if channel:
                     await self.finalizar_enquete(message_id, channel)
+                else:
+                    logger.warning(f"Canal da enquete {poll_id} não encontrado")
+                    sem_canal.append(poll_id)
+            
+            await DatabaseManager.bulk_update('polls', 'is_active = 0', ids=sem_canal)
                     
         except Exception as e:
-            logger.error(f"Erro ao fechar enquete automaticamente: {e}")
+            logger.error(f"Erro ao fechar enquetes automaticamente: {e}")
+            # Enquetes já encerradas saem do IN (...) pelo is_active na próxima tentativa
+            for poll_id in poll_ids:
+                self.bot.scheduler.schedule('poll', poll_id, now_epoch() + DISPATCH_RETRY_DELAY)
     
     async def finalizar_enquete(self, message_id, channel):
         """Finaliza uma enquete e mostra os resultados"""
         try:
             # Marcar como inativa
+            enquete = self.enquetes_ativas.pop(message_id, None)
+            self.enquetes_alteradas.pop(message_id, None)
             await DatabaseManager.execute_query(
                 "UPDATE polls SET is_active = 0 WHERE message_id = ?",
                 (message_id,)
             )
             
+            # Mostrar a contagem final na própria mensagem e retirar os botões de voto
+            if enquete:
+                try:
+                    await channel.get_partial_message(message_id).edit(
+                        embed=self.montar_embed_enquete(enquete, encerrada=True),
+                        view=None
+                    )
+                except discord.HTTPException as e:
+                    logger.warning(f"Não foi possível atualizar a mensagem da enquete {message_id}: {e}")
+            
             # Buscar dados da enquete
             poll_data = await DatabaseManager.fetch_one(
-                "SELECT title, options FROM polls WHERE message_id = ?",
+                "SELECT id, title, options FROM polls WHERE message_id = ?",
                 (message_id,)
             )
             
             if not poll_data:
                 return
             
-            titulo, opcoes_json = poll_data
+            poll_id, titulo, opcoes_json = poll_data
             opcoes = json.loads(opcoes_json)
             
-            # Buscar a mensagem original
-            try:
-                message = await channel.fetch_message(message_id)
-                
-                # Contar votos
-                votos = [0] * len(opcoes)
-                total_votos = 0
-                
-                for i, emoji in enumerate(self.number_emojis[:len(opcoes)]):
-                    for reaction in message.reactions:
-                        if str(reaction.emoji) == emoji:
-                            votos[i] = reaction.count - 1  # -1 para excluir a reação do bot
-                            total_votos += votos[i]
-                
-                # Criar embed de resultados
-                embed = discord.Embed(
-                    title=f"{EMOJIS['poll']} Resultados da Enquete: {titulo}",
-                    color=DEFAULT_COLOR,
-                    timestamp=datetime.now()
-                )
-                
-                resultados_texto = ""
-                for i, (opcao, votos_opcao) in enumerate(zip(opcoes, votos)):
-                    porcentagem = (votos_opcao / total_votos * 100) if total_votos > 0 else 0
-                    barra = "█" * int(porcentagem / 10) + "░" * (10 - int(porcentagem / 10))
-                    resultados_texto += f"{self.number_emojis[i]} **{opcao}**\n"
-                    resultados_texto += f"`{barra}` {votos_opcao} votos ({porcentagem:.1f}%)\n\n"
-                
-                embed.add_field(name="Resultados:", value=resultados_texto, inline=False)
-                embed.add_field(name="Total de Votos:", value=str(total_votos), inline=True)
-                embed.set_footer(text="Enquete finalizada")
-                
-                await channel.send(embed=embed)
-                
-            except discord.NotFound:
-                logger.warning(f"Mensagem da enquete {message_id} não encontrada")
+            # Contar votos pela apuração em memória ou, na falta dela, pelo banco
+            if enquete:
+                await self.gravar_votos_pendentes(poll_id)
+                votos = list(enquete['contagem'])
+            else:
+                votos = await self.apurar_votos(poll_id, len(opcoes))
+            
+            total_votos = sum(votos)
+            
+            # Criar embed de resultados
+            embed = discord.Embed(
+                title=truncate_text(f"{EMOJIS['poll']} Resultados da Enquete: {titulo}", EMBED_TITLE_LIMIT),
+                color=DEFAULT_COLOR,
+                timestamp=datetime.now()
+            )
+            
+            embed.add_field(name="Resultados:", value=self.formatar_resultados(opcoes, votos), inline=False)
+            embed.add_field(name="Total de Votos:", value=str(total_votos), inline=True)
+            embed.set_footer(text="Enquete finalizada")
+            
+            await channel.send(embed=embed)
                 
         except Exception as e:
             logger.error(f"Erro ao finalizar enquete: {e}")
     
-    @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        """Monitora reações em enquetes"""
-        if user.bot:
+    async def apurar_votos(self, poll_id, num_opcoes):
+        """Conta os votos gravados de uma enquete com um único GROUP BY"""
+        votos = [0] * num_opcoes
+        linhas = await DatabaseManager.fetch_all(
+            '''SELECT option_index, COUNT(*) FROM poll_votes
+               WHERE poll_id = ? GROUP BY option_index''',
+            (poll_id,)
+        )
+        for option_index, quantidade in linhas:
+            if 0 <= option_index < num_opcoes:
+                votos[option_index] = quantidade
+        return votos
+    
+    async def reconstruir_apuracoes(self):
+        """Reconstrói a apuração em memória das enquetes ativas a partir de poll_votes"""
+        por_id = {enquete['id']: enquete for enquete in self.enquetes_ativas.values()}
+        
+        # Parte das enquetes ativas e busca os votos de cada uma pelo índice UNIQUE(poll_id, user_id),
+        # em vez de varrer poll_votes inteira (votos de enquetes encerradas se acumulam para sempre)
+        votos = await DatabaseManager.fetch_all(
+            '''SELECT poll_id, user_id, option_index FROM poll_votes
+               WHERE poll_id IN (SELECT id FROM polls WHERE is_active = 1)''',
+            raise_errors=True
+        )
+        for poll_id, user_id, option_index in votos:
+            enquete = por_id.get(poll_id)
+            if enquete and 0 <= option_index < len(enquete['contagem']):
+                enquete['votos'][user_id] = option_index
+                enquete['contagem'][option_index] += 1
+        
+        logger.info(f"Apuração de {len(por_id)} enquete(s) reconstruída com {len(votos)} voto(s)")
+    
+    def registrar_voto(self, enquete, user_id, option_index):
+        """Atualiza a apuração em memória e agenda a gravação; retorna o voto anterior do usuário"""
+        anterior = enquete['votos'].get(user_id)
+        if anterior == option_index:
+            return anterior
+        
+        if anterior is not None:
+            enquete['contagem'][anterior] -= 1
+        enquete['votos'][user_id] = option_index
+        enquete['contagem'][option_index] += 1
+        
+        self.votos_pendentes[(enquete['id'], user_id)] = option_index
+        self.marcar_alterada(enquete)
+        return anterior
+    
+    def remover_voto(self, enquete, user_id, option_index):
+        """Remove o voto do usuário se ele ainda estiver na opção informada"""
+        if enquete['votos'].get(user_id) != option_index:
+            return False
+        
+        del enquete['votos'][user_id]
+        enquete['contagem'][option_index] -= 1
+        
+        self.votos_pendentes[(enquete['id'], user_id)] = None
+        self.marcar_alterada(enquete)
+        return True
+    
+    @tasks.loop(seconds=POLL_VOTE_FLUSH_INTERVAL)
+    async def gravar_votos(self):
+        """Task que grava em lote os votos acumulados em memória"""
+        await self.gravar_votos_pendentes()
+    
+    async def gravar_votos_pendentes(self, poll_id=None):
+        """Grava os votos pendentes (de todas as enquetes ou de uma só) em uma transação"""
+        if poll_id is None:
+            pendentes, self.votos_pendentes = self.votos_pendentes, {}
+        else:
+            pendentes = {
+                chave: self.votos_pendentes.pop(chave)
+                for chave in [chave for chave in self.votos_pendentes if chave[0] == poll_id]
+            }
+        
+        if not pendentes:
             return
-            
+        
+        votos = [(p_id, user_id, indice) for (p_id, user_id), indice in pendentes.items() if indice is not None]
+        removidos = [(p_id, user_id) for (p_id, user_id), indice in pendentes.items() if indice is None]
+        
+        operacoes = []
+        if votos:
+            operacoes.append((
+                "INSERT OR REPLACE INTO poll_votes (poll_id, user_id, option_index) VALUES (?, ?, ?)",
+                votos, True
+            ))
+        if removidos:
+            operacoes.append((
+                "DELETE FROM poll_votes WHERE poll_id = ? AND user_id = ?",
+                removidos, True
+            ))
+        
         try:
-            # Verificar se é uma enquete ativa
-            poll_data = await DatabaseManager.fetch_one(
-                "SELECT id, options FROM polls WHERE message_id = ? AND is_active = 1",
-                (reaction.message.id,)
+            await DatabaseManager.execute_transaction(operacoes)
+        except Exception as e:
+            logger.error(f"Erro ao gravar votos: {e}")
+            # Devolver à fila o que não foi substituído por um voto mais recente
+            for chave, indice in pendentes.items():
+                self.votos_pendentes.setdefault(chave, indice)
+    
+    async def registrar_voto_botao(self, interaction, poll_id, option_index):
+        """Registra um voto feito pelos botões, com uma única resposta à interação"""
+        enquete = self.enquetes_ativas.get(interaction.message.id)
+        if enquete is None or enquete['id'] != poll_id:
+            await interaction.response.send_message(
+                f"{EMOJIS['cross']} Esta enquete já foi encerrada!",
+                ephemeral=True
             )
+            return
+        
+        self.registrar_voto(enquete, interaction.user.id, option_index)
+        
+        await interaction.response.send_message(
+            f"{EMOJIS['check']} Voto registrado em {self.number_emojis[option_index]} "
+            f"**{enquete['opcoes'][option_index]}**",
+            ephemeral=True
+        )
+    
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        """Monitora reações em enquetes (não depende do cache de mensagens)"""
+        # Verificar no índice em memória se é uma enquete ativa (sem acessar o banco)
+        enquete = self.enquetes_ativas.get(payload.message_id)
+        if enquete is None or payload.user_id == self.bot.user.id:
+            return
+        
+        if payload.member is not None and payload.member.bot:
+            return
             
-            if not poll_data:
+        try:
+            # Verificar se a reação é válida
+            option_index = enquete['emojis'].get(str(payload.emoji))
+            if option_index is None:
                 return
             
-            poll_id, opcoes_json = poll_data
-            opcoes = json.loads(opcoes_json)
+            # Registrar ou atualizar voto
+            anterior = self.registrar_voto(enquete, payload.user_id, option_index)
             
-            # Verificar se a reação é válida
-            emoji_str = str(reaction.emoji)
-            if emoji_str in self.number_emojis[:len(opcoes)]:
-                option_index = self.number_emojis.index(emoji_str)
-                
-                # Registrar ou atualizar voto
-                await DatabaseManager.execute_query(
-                    '''INSERT OR REPLACE INTO poll_votes (poll_id, user_id, option_index)
-                       VALUES (?, ?, ?)''',
-                    (poll_id, user.id, option_index)
+            # Remover a reação do voto anterior usando apenas os IDs do evento
+            if anterior is not None and anterior != option_index:
+                message = self.bot.get_partial_messageable(payload.channel_id).get_partial_message(
+                    payload.message_id
                 )
-                
-                # Remover outras reações do usuário
-                for i, emoji in enumerate(self.number_emojis[:len(opcoes)]):
-                    if i != option_index:
-                        try:
-                            await reaction.message.remove_reaction(emoji, user)
-                        except:
-                            pass
+                try:
+                    await message.remove_reaction(
+                        self.number_emojis[anterior], discord.Object(id=payload.user_id)
+                    )
+                except discord.HTTPException:
+                    pass
                             
         except Exception as e:
             logger.error(f"Erro ao processar reação: {e}")
+    
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        """Remove o voto quando o usuário retira a reação da opção votada"""
+        enquete = self.enquetes_ativas.get(payload.message_id)
+        if enquete is None:
+            return
+        
+        option_index = enquete['emojis'].get(str(payload.emoji))
+        if option_index is None:
+            return
+        
+        # Só remove se o voto atual ainda for nesta opção
+        # (a remoção feita pelo próprio bot ao trocar de voto não apaga o voto novo)
+        self.remover_voto(enquete, payload.user_id, option_index)
 
 async def setup(bot):
     await bot.add_cog(EnquetesCog(bot))
@@ -1,10 +1,11 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
 import asyncio
-from database import DatabaseManager
-from config import EMOJIS, DEFAULT_COLOR, MAX_REMINDER_DAYS
+from database import DatabaseManager, to_epoch, now_epoch
+from config import EMOJIS, DEFAULT_COLOR, MAX_REMINDER_DAYS, DISPATCH_RETRY_DELAY
+from utils.cache import AutocompleteCache
 import logging
 import re
 
@@ -15,10 +16,25 @@ class LembretesCog(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.verificar_lembretes.start()
+        # Lembretes pendentes de cada (usuário, servidor) para o autocomplete dos IDs
+        self.cache_lembretes = AutocompleteCache(self.carregar_lembretes_autocomplete)
+    
+    async def cog_load(self):
+        # Carregar lembretes pendentes no agendador do bot; sem varredura periódica, uma falha
+        # aqui precisa impedir o carregamento do cog em vez de deixar os lembretes esquecidos
+        pendentes = await DatabaseManager.fetch_all(
+            "SELECT id, remind_at FROM reminders WHERE is_sent = 0",
+            raise_errors=True
+        )
+        
+        self.bot.scheduler.register('reminder', self.disparar_lembretes)
+        for lembrete_id, remind_at in pendentes:
+            self.bot.scheduler.schedule('reminder', lembrete_id, remind_at)
+        
+        logger.info(f"{len(pendentes)} lembrete(s) pendente(s) agendado(s)")
     
     def cog_unload(self):
-        self.verificar_lembretes.cancel()
+        self.bot.scheduler.unregister('reminder')
     
     @app_commands.command(name="lembrete", description="Criar um lembrete")
     @app_commands.describe(
@@ -55,7 +71,7 @@ class LembretesCog(commands.Cog):
             remind_at = datetime.now() + tempo_delta
             
             # Salvar no banco de dados
-            await DatabaseManager.execute_query(
+            cursor = await DatabaseManager.execute_query(
                 '''INSERT INTO reminders (user_id, guild_id, channel_id, message, remind_at)
                    VALUES (?, ?, ?, ?, ?)''',
                 (
@@ -63,10 +79,14 @@ class LembretesCog(commands.Cog):
                     interaction.guild_id,
                     interaction.channel_id,
                     mensagem,
-                    remind_at
+                    to_epoch(remind_at)
                 )
             )
             
+            # Agendar o envio
+            self.bot.scheduler.schedule('reminder', cursor.lastrowid, to_epoch(remind_at))
+            self.cache_lembretes.invalidate((interaction.user.id, interaction.guild_id))
+            
             # Criar embed de confirmação
             embed = discord.Embed(
                 title=f"{EMOJIS['reminder']} Lembrete Criado",
@@ -127,12 +147,10 @@ class LembretesCog(commands.Cog):
             )
             
             for i, (lembrete_id, mensagem, remind_at) in enumerate(lembretes[:10], 1):
-                remind_datetime = datetime.fromisoformat(remind_at.replace('Z', '+00:00'))
-                
                 embed.add_field(
                     name=f"{i}. ID: {lembrete_id}",
                     value=f"**Mensagem:** {mensagem[:100]}{'...' if len(mensagem) > 100 else ''}\n"
-                          f"**Quando:** <t:{int(remind_datetime.timestamp())}:R>",
+                          f"**Quando:** <t:{remind_at}:R>",
                     inline=False
                 )
             
@@ -153,29 +171,27 @@ class LembretesCog(commands.Cog):
     async def cancelar_lembrete(self, interaction: discord.Interaction, lembrete_id: int):
         """Cancela um lembrete específico"""
         try:
-            # Verificar se o lembrete existe e pertence ao usuário
-            lembrete = await DatabaseManager.fetch_one(
-                '''SELECT message FROM reminders 
-                   WHERE id = ? AND user_id = ? AND guild_id = ? AND is_sent = 0''',
+            # Marcar como enviado (cancelado) se existir, pertencer ao usuário e estiver pendente
+            lembretes = await DatabaseManager.execute_returning(
+                '''UPDATE reminders SET is_sent = 1
+                   WHERE id = ? AND user_id = ? AND guild_id = ? AND is_sent = 0
+                   RETURNING message''',
                 (lembrete_id, interaction.user.id, interaction.guild_id)
             )
             
-            if not lembrete:
+            if not lembretes:
                 await interaction.response.send_message(
                     f"{EMOJIS['cross']} Lembrete não encontrado ou já foi enviado!",
                     ephemeral=True
                 )
                 return
             
-            # Marcar como enviado (cancelado)
-            await DatabaseManager.execute_query(
-                "UPDATE reminders SET is_sent = 1 WHERE id = ?",
-                (lembrete_id,)
-            )
+            self.bot.scheduler.cancel('reminder', lembrete_id)
+            self.cache_lembretes.invalidate((interaction.user.id, interaction.guild_id))
             
             embed = discord.Embed(
                 title=f"{EMOJIS['check']} Lembrete Cancelado",
-                description=f"Lembrete **{lembrete[0][:100]}** foi cancelado com sucesso.",
+                description=f"Lembrete **{lembretes[0][0][:100]}** foi cancelado com sucesso.",
                 color=DEFAULT_COLOR
             )
             
@@ -189,30 +205,48 @@ class LembretesCog(commands.Cog):
                 ephemeral=True
             )
     
-    @tasks.loop(seconds=60)  # Verificar a cada minuto
-    async def verificar_lembretes(self):
-        """Task que verifica lembretes que devem ser enviados"""
+    async def disparar_lembretes(self, lembrete_ids):
+        """Chamado pelo agendador com os lembretes que venceram"""
+        # O agendador já removeu os ids: os que não forem confirmados voltam para nova tentativa
+        pendentes = set(lembrete_ids)
         try:
-            # Buscar lembretes que devem ser enviados
+            placeholders = ', '.join('?' * len(lembrete_ids))
             lembretes = await DatabaseManager.fetch_all(
-                '''SELECT id, user_id, guild_id, channel_id, message, remind_at 
-                   FROM reminders 
-                   WHERE remind_at <= ? AND is_sent = 0''',
-                (datetime.now(),)
+                f'''SELECT id, user_id, guild_id, channel_id, message, remind_at 
+                    FROM reminders 
+                    WHERE id IN ({placeholders}) AND is_sent = 0''',
+                lembrete_ids,
+                raise_errors=True
+            )
+            # Ids ausentes foram cancelados ou já enviados
+            pendentes = {lembrete[0] for lembrete in lembretes}
+            
+            resultados = await self.bot.dispatcher.dispatch(
+                lembretes,
+                self.enviar_lembrete,
+                channel_of=lambda lembrete: lembrete[3],
+                due_of=lambda lembrete: lembrete[5],
+                label="lembretes"
             )
             
-            for lembrete in lembretes:
-                await self.enviar_lembrete(lembrete)
+            # Marcar todos os lembretes processados de uma só vez
+            enviados = [lembrete[0] for lembrete, ok in zip(lembretes, resultados) if ok is True]
+            await DatabaseManager.bulk_update('reminders', 'is_sent = 1', ids=enviados)
+            pendentes.difference_update(enviados)
+            
+            for chave in {(lembrete[1], lembrete[2]) for lembrete in lembretes}:
+                self.cache_lembretes.invalidate(chave)
                 
         except Exception as e:
-            logger.error(f"Erro ao verificar lembretes: {e}")
-    
-    @verificar_lembretes.before_loop
-    async def before_verificar_lembretes(self):
-        await self.bot.wait_until_ready()
+            logger.error(f"Erro ao disparar lembretes: {e}")
+        finally:
+            if pendentes:
+                logger.warning(f"{len(pendentes)} lembrete(s) não enviado(s), nova tentativa em {DISPATCH_RETRY_DELAY}s")
+            for lembrete_id in pendentes:
+                self.bot.scheduler.schedule('reminder', lembrete_id, now_epoch() + DISPATCH_RETRY_DELAY)
     
     async def enviar_lembrete(self, lembrete_data):
-        """Envia um lembrete específico"""
+        """Envia um lembrete específico, retornando True se ele deve ser marcado como enviado"""
         try:
             lembrete_id, user_id, guild_id, channel_id, mensagem, remind_at = lembrete_data
             
@@ -222,8 +256,7 @@ class LembretesCog(commands.Cog):
             
             if not user or not channel:
                 logger.warning(f"Usuário ou canal não encontrado para lembrete {lembrete_id}")
-                await self.marcar_lembrete_enviado(lembrete_id)
-                return
+                return True
             
             # Criar embed do lembrete
             embed = discord.Embed(
@@ -245,19 +278,12 @@ class LembretesCog(commands.Cog):
                 except discord.Forbidden:
                     logger.warning(f"Não foi possível enviar lembrete {lembrete_id}")
             
-            # Marcar como enviado
-            await self.marcar_lembrete_enviado(lembrete_id)
             logger.info(f"Lembrete {lembrete_id} enviado para {user}")
+            return True
             
         except Exception as e:
             logger.error(f"Erro ao enviar lembrete: {e}")
-    
-    async def marcar_lembrete_enviado(self, lembrete_id):
-        """Marca um lembrete como enviado"""
-        await DatabaseManager.execute_query(
-            "UPDATE reminders SET is_sent = 1 WHERE id = ?",
-            (lembrete_id,)
-        )
+            return False
     
     def parse_tempo(self, tempo_str):
         """Converte string de tempo em timedelta"""
@@ -294,6 +320,26 @@ class LembretesCog(commands.Cog):
             return f"{segundos // 3600} hora(s)"
         else:
             return f"{segundos // 86400} dia(s)"
+    
+    async def carregar_lembretes_autocomplete(self, chave):
+        """Carrega (id, mensagem, envio) dos lembretes pendentes do usuário para o autocomplete"""
+        user_id, guild_id = chave
+        return await DatabaseManager.fetch_all(
+            '''SELECT id, message, remind_at FROM reminders
+               WHERE user_id = ? AND guild_id = ? AND is_sent = 0
+               ORDER BY remind_at ASC
+               LIMIT 500''',
+            (user_id, guild_id)
+        )
+    
+    @cancelar_lembrete.autocomplete('lembrete_id')
+    async def lembrete_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Sugere os lembretes pendentes do usuário pelo ID ou pela mensagem"""
+        try:
+            return await self.cache_lembretes.choices((interaction.user.id, interaction.guild_id), current)
+        except Exception as e:
+            logger.error(f"Erro no autocomplete de lembretes: {e}")
+            return []
 
 async def setup(bot):
     await bot.add_cog(LembretesCog(bot))
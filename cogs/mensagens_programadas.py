@@ -1,10 +1,11 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
 import asyncio
-from database import DatabaseManager
-from config import EMOJIS, DEFAULT_COLOR, MAX_MESSAGE_LENGTH
+from database import DatabaseManager, to_epoch, now_epoch
+from config import EMOJIS, DEFAULT_COLOR, MAX_MESSAGE_LENGTH, DISPATCH_RETRY_DELAY
+from utils.cache import AutocompleteCache
 import logging
 import re
 
@@ -15,10 +16,25 @@ class MensagensProgramadasCog(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.verificar_mensagens.start()
+        # Mensagens pendentes de cada servidor para o autocomplete dos IDs
+        self.cache_mensagens = AutocompleteCache(self.carregar_mensagens_autocomplete)
+    
+    async def cog_load(self):
+        # Carregar mensagens pendentes no agendador do bot; sem varredura periódica, uma falha
+        # aqui precisa impedir o carregamento do cog em vez de deixar as mensagens esquecidas
+        pendentes = await DatabaseManager.fetch_all(
+            "SELECT id, send_at FROM scheduled_messages WHERE is_sent = 0",
+            raise_errors=True
+        )
+        
+        self.bot.scheduler.register('scheduled_message', self.disparar_mensagens)
+        for msg_id, send_at in pendentes:
+            self.bot.scheduler.schedule('scheduled_message', msg_id, send_at)
+        
+        logger.info(f"{len(pendentes)} mensagem(ns) programada(s) agendada(s)")
     
     def cog_unload(self):
-        self.verificar_mensagens.cancel()
+        self.bot.scheduler.unregister('scheduled_message')
     
     @app_commands.command(name="agendar_mensagem", description="Agendar uma mensagem para ser enviada")
     @app_commands.describe(
@@ -86,7 +102,7 @@ class MensagensProgramadasCog(commands.Cog):
             send_at = datetime.now() + tempo_delta
             
             # Salvar no banco de dados
-            await DatabaseManager.execute_query(
+            cursor = await DatabaseManager.execute_query(
                 '''INSERT INTO scheduled_messages 
                    (guild_id, channel_id, author_id, message, send_at, repeat_interval)
                    VALUES (?, ?, ?, ?, ?, ?)''',
@@ -95,11 +111,15 @@ class MensagensProgramadasCog(commands.Cog):
                     canal.id,
                     interaction.user.id,
                     mensagem,
-                    send_at,
+                    to_epoch(send_at),
                     repeat_interval
                 )
             )
             
+            # Agendar o envio
+            self.bot.scheduler.schedule('scheduled_message', cursor.lastrowid, to_epoch(send_at))
+            self.cache_mensagens.invalidate(interaction.guild_id)
+            
             # Criar embed de confirmação
             embed = discord.Embed(
                 title=f"{EMOJIS['message']} Mensagem Agendada",
@@ -171,7 +191,6 @@ class MensagensProgramadasCog(commands.Cog):
             )
             
             for i, (msg_id, channel_id, author_id, mensagem, send_at, repeat_interval) in enumerate(mensagens[:10], 1):
-                send_datetime = datetime.fromisoformat(send_at.replace('Z', '+00:00'))
                 canal = self.bot.get_channel(channel_id)
                 autor = self.bot.get_user(author_id)
                 
@@ -180,7 +199,7 @@ class MensagensProgramadasCog(commands.Cog):
                 
                 valor = f"**Canal:** #{canal_nome}\n"
                 valor += f"**Autor:** {autor_nome}\n"
-                valor += f"**Quando:** <t:{int(send_datetime.timestamp())}:R>\n"
+                valor += f"**Quando:** <t:{send_at}:R>\n"
                 
                 if repeat_interval:
                     valor += f"**Repetir:** A cada {repeat_interval}\n"
@@ -220,25 +239,23 @@ class MensagensProgramadasCog(commands.Cog):
                 )
                 return
             
-            # Verificar se a mensagem existe
-            mensagem = await DatabaseManager.fetch_one(
-                '''SELECT message FROM scheduled_messages 
-                   WHERE id = ? AND guild_id = ? AND is_sent = 0''',
+            # Marcar como enviada (cancelada) se existir e ainda estiver pendente
+            canceladas = await DatabaseManager.execute_returning(
+                '''UPDATE scheduled_messages SET is_sent = 1
+                   WHERE id = ? AND guild_id = ? AND is_sent = 0
+                   RETURNING id''',
                 (mensagem_id, interaction.guild_id)
             )
             
-            if not mensagem:
+            if not canceladas:
                 await interaction.response.send_message(
                     f"{EMOJIS['cross']} Mensagem não encontrada ou já foi enviada!",
                     ephemeral=True
                 )
                 return
             
-            # Marcar como enviada (cancelada)
-            await DatabaseManager.execute_query(
-                "UPDATE scheduled_messages SET is_sent = 1 WHERE id = ?",
-                (mensagem_id,)
-            )
+            self.bot.scheduler.cancel('scheduled_message', mensagem_id)
+            self.cache_mensagens.invalidate(interaction.guild_id)
             
             embed = discord.Embed(
                 title=f"{EMOJIS['check']} Mensagem Cancelada",
@@ -256,85 +273,100 @@ class MensagensProgramadasCog(commands.Cog):
                 ephemeral=True
             )
     
-    @tasks.loop(seconds=60)  # Verificar a cada minuto
-    async def verificar_mensagens(self):
-        """Task que verifica mensagens que devem ser enviadas"""
+    async def disparar_mensagens(self, msg_ids):
+        """Chamado pelo agendador com as mensagens programadas que venceram"""
+        # O agendador já removeu os ids: os que não forem confirmados voltam para nova tentativa
+        pendentes = set(msg_ids)
         try:
-            # Buscar mensagens que devem ser enviadas
+            placeholders = ', '.join('?' * len(msg_ids))
             mensagens = await DatabaseManager.fetch_all(
-                '''SELECT id, guild_id, channel_id, message, send_at, repeat_interval 
-                   FROM scheduled_messages 
-                   WHERE send_at <= ? AND is_sent = 0''',
-                (datetime.now(),)
+                f'''SELECT id, guild_id, channel_id, message, send_at, repeat_interval 
+                    FROM scheduled_messages 
+                    WHERE id IN ({placeholders}) AND is_sent = 0''',
+                msg_ids,
+                raise_errors=True
+            )
+            # Ids ausentes foram cancelados ou já enviados
+            pendentes = {mensagem[0] for mensagem in mensagens}
+            
+            resultados = await self.bot.dispatcher.dispatch(
+                mensagens,
+                self.enviar_mensagem_programada,
+                channel_of=lambda mensagem: mensagem[2],
+                due_of=lambda mensagem: mensagem[4],
+                label="mensagens programadas"
             )
             
-            for mensagem in mensagens:
-                await self.enviar_mensagem_programada(mensagem)
-                
-        except Exception as e:
-            logger.error(f"Erro ao verificar mensagens programadas: {e}")
-    
-    @verificar_mensagens.before_loop
-    async def before_verificar_mensagens(self):
-        await self.bot.wait_until_ready()
-    
-    async def enviar_mensagem_programada(self, mensagem_data):
-        """Envia uma mensagem programada"""
-        try:
-            msg_id, guild_id, channel_id, mensagem, send_at, repeat_interval = mensagem_data
-            
-            # Buscar canal
-            channel = self.bot.get_channel(channel_id)
-            
-            if not channel:
-                logger.warning(f"Canal não encontrado para mensagem {msg_id}")
-                await self.marcar_mensagem_enviada(msg_id)
-                return
+            # Gravar o resultado da rodada em uma única transação
+            concluidas = []
+            reagendadas = []
+            for mensagem, proximo_envio in zip(mensagens, resultados):
+                if isinstance(proximo_envio, Exception):
+                    continue
+                if proximo_envio:
+                    reagendadas.append((proximo_envio, mensagem[0]))
+                else:
+                    concluidas.append(mensagem[0])
+            
+            await DatabaseManager.bulk_update(
+                'scheduled_messages', 'is_sent = 1', ids=concluidas,
+                row_query="UPDATE scheduled_messages SET send_at = ? WHERE id = ?",
+                rows=reagendadas
+            )
+            pendentes.difference_update(concluidas)
+            pendentes.difference_update(msg_id for _, msg_id in reagendadas)
             
-            # Tentar enviar mensagem
-            try:
-                await channel.send(mensagem)
-                logger.info(f"Mensagem programada {msg_id} enviada")
-            except discord.Forbidden:
-                logger.warning(f"Sem permissão para enviar mensagem {msg_id}")
-            except Exception as e:
-                logger.error(f"Erro ao enviar mensagem {msg_id}: {e}")
+            for proximo_envio, msg_id in reagendadas:
+                self.bot.scheduler.schedule('scheduled_message', msg_id, proximo_envio)
             
-            # Se tem repetição, agendar próximo envio
-            if repeat_interval:
-                await self.reagendar_mensagem(msg_id, repeat_interval)
-            else:
-                await self.marcar_mensagem_enviada(msg_id)
+            for guild_id in {mensagem[1] for mensagem in mensagens}:
+                self.cache_mensagens.invalidate(guild_id)
                 
         except Exception as e:
-            logger.error(f"Erro ao processar mensagem programada: {e}")
+            logger.error(f"Erro ao disparar mensagens programadas: {e}")
+        finally:
+            if pendentes:
+                logger.warning(f"{len(pendentes)} mensagem(ns) programada(s) não enviada(s), nova tentativa em {DISPATCH_RETRY_DELAY}s")
+            for msg_id in pendentes:
+                self.bot.scheduler.schedule('scheduled_message', msg_id, now_epoch() + DISPATCH_RETRY_DELAY)
     
-    async def reagendar_mensagem(self, msg_id, repeat_interval):
-        """Reagenda uma mensagem repetitiva"""
+    async def enviar_mensagem_programada(self, mensagem_data):
+        """
+        Envia uma mensagem programada.
+        Retorna o próximo envio (segundos desde a época) se ela se repete, ou None se foi concluída.
+        Falhas de envio que não sejam falta de permissão são levantadas, para uma nova tentativa.
+        """
+        msg_id, guild_id, channel_id, mensagem, send_at, repeat_interval = mensagem_data
+        
+        # Buscar canal
+        channel = self.bot.get_channel(channel_id)
+        
+        if not channel:
+            logger.warning(f"Canal não encontrado para mensagem {msg_id}")
+            return None
+        
+        # Tentar enviar mensagem; outros erros (HTTP 5xx, rede) sobem para o dispatcher
+        # e a mensagem volta ao agendador para nova tentativa
         try:
-            # Calcular próximo envio
-            tempo_delta = self.parse_tempo(repeat_interval)
-            if tempo_delta:
-                next_send = datetime.now() + tempo_delta
-                
-                await DatabaseManager.execute_query(
-                    "UPDATE scheduled_messages SET send_at = ? WHERE id = ?",
-                    (next_send, msg_id)
-                )
-                
-                logger.info(f"Mensagem {msg_id} reagendada para {next_send}")
-            else:
-                await self.marcar_mensagem_enviada(msg_id)
-                
-        except Exception as e:
-            logger.error(f"Erro ao reagendar mensagem: {e}")
+            await channel.send(mensagem)
+            logger.info(f"Mensagem programada {msg_id} enviada")
+        except discord.Forbidden:
+            logger.warning(f"Sem permissão para enviar mensagem {msg_id}")
+        
+        # Se tem repetição, calcular próximo envio
+        if repeat_interval:
+            return self.calcular_proximo_envio(msg_id, repeat_interval)
+        return None
     
-    async def marcar_mensagem_enviada(self, msg_id):
-        """Marca uma mensagem como enviada"""
-        await DatabaseManager.execute_query(
-            "UPDATE scheduled_messages SET is_sent = 1 WHERE id = ?",
-            (msg_id,)
-        )
+    def calcular_proximo_envio(self, msg_id, repeat_interval):
+        """Calcula o próximo envio de uma mensagem repetitiva"""
+        tempo_delta = self.parse_tempo(repeat_interval)
+        if not tempo_delta:
+            return None
+        
+        next_send = datetime.now() + tempo_delta
+        logger.info(f"Mensagem {msg_id} reagendada para {next_send}")
+        return to_epoch(next_send)
     
     def parse_tempo(self, tempo_str):
         """Converte string de tempo em timedelta"""
@@ -358,6 +390,28 @@ class MensagensProgramadasCog(commands.Cog):
             return timedelta(days=valor)
         
         return None
+    
+    async def carregar_mensagens_autocomplete(self, guild_id):
+        """Carrega (id, mensagem, envio) das mensagens pendentes do servidor para o autocomplete"""
+        return await DatabaseManager.fetch_all(
+            '''SELECT id, message, send_at FROM scheduled_messages
+               WHERE guild_id = ? AND is_sent = 0
+               ORDER BY send_at ASC
+               LIMIT 500''',
+            (guild_id,)
+        )
+    
+    @cancelar_mensagem.autocomplete('mensagem_id')
+    async def mensagem_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Sugere as mensagens agendadas do servidor pelo ID ou pelo texto"""
+        try:
+            # Ver e cancelar mensagens agendadas exige Gerenciar Mensagens: sem ela, nada de sugestões
+            if not interaction.user.guild_permissions.manage_messages:
+                return []
+            return await self.cache_mensagens.choices(interaction.guild_id, current)
+        except Exception as e:
+            logger.error(f"Erro no autocomplete de mensagens: {e}")
+            return []
 
 async def setup(bot):
     await bot.add_cog(MensagensProgramadasCog(bot))
@@ -1,13 +1,90 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from datetime import datetime, timedelta
-from database import DatabaseManager
-from config import EMOJIS, DEFAULT_COLOR, MAX_TASKS_PER_USER
+from database import DatabaseManager, to_epoch, now_epoch
+from config import (
+    EMOJIS, DEFAULT_COLOR, MAX_TASKS_PER_USER, MAX_BULK_TASK_IDS,
+    TASK_DUE_CHECK_INTERVAL, TASK_DUE_SOON_WINDOW, TASK_DUE_BATCH_SIZE
+)
+from utils.helpers import parse_id_list, format_list_items
+from utils.cache import AutocompleteCache
 import logging
+import math
+import re
 
 logger = logging.getLogger(__name__)
 
+# Tarefas exibidas por página em /minhas_tarefas
+TAREFAS_POR_PAGINA = 10
+
+# Resultados exibidos por /buscar_tarefa
+RESULTADOS_BUSCA = 10
+
+# Estágios de aviso de prazo gravados em tasks.due_notice
+AVISO_NENHUM = 0
+AVISO_EM_BREVE = 1
+AVISO_ATRASADA = 2
+
+def consulta_fts(texto):
+    """
+    Converte o texto digitado em uma consulta FTS5 segura: cada palavra vira um termo
+    entre aspas com busca por prefixo, e todos os termos precisam aparecer.
+    """
+    palavras = re.findall(r"\w+", texto)
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+class PaginasTarefas(discord.ui.View):
+    """Navegação entre as páginas de /minhas_tarefas (cada página é uma consulta por cursor)"""
+    
+    def __init__(self, cog, filtros, estatisticas):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.filtros = filtros
+        self.estatisticas = estatisticas
+        self.total_paginas = max(1, math.ceil(estatisticas[0] / TAREFAS_POR_PAGINA))
+        # Cursor de início de cada página visitada (a primeira começa do zero)
+        self.inicios = [None]
+        self.tarefas = []
+        self.proximo = None
+    
+    async def carregar_pagina(self):
+        """Busca a página atual e atualiza o estado dos botões"""
+        self.tarefas, self.proximo = await self.cog.buscar_pagina(*self.filtros, cursor=self.inicios[-1])
+        self.anterior.disabled = len(self.inicios) == 1
+        self.proxima.disabled = self.proximo is None
+    
+    def criar_embed(self):
+        return self.cog.criar_embed_tarefas(
+            self.tarefas, self.estatisticas, len(self.inicios), self.total_paginas
+        )
+    
+    async def interaction_check(self, interaction):
+        return interaction.user.id == self.filtros[0]
+    
+    async def mostrar(self, interaction):
+        try:
+            await self.carregar_pagina()
+            await interaction.response.edit_message(embed=self.criar_embed(), view=self)
+        except Exception as e:
+            logger.error(f"Erro ao paginar tarefas: {e}")
+            await interaction.response.send_message(
+                f"{EMOJIS['cross']} Erro ao buscar tarefas: {str(e)}",
+                ephemeral=True
+            )
+    
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def anterior(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if len(self.inicios) > 1:
+            self.inicios.pop()
+        await self.mostrar(interaction)
+    
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def proxima(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.proximo is not None:
+            self.inicios.append(self.proximo)
+        await self.mostrar(interaction)
+
 class TarefasCog(commands.Cog):
     """Sistema de gerenciamento de tarefas (To-do list)"""
     
@@ -23,6 +100,14 @@ class TarefasCog(commands.Cog):
             2: "Média", 
             3: "Baixa"
         }
+        # Tarefas de cada (usuário, servidor) para o autocomplete dos IDs
+        self.cache_tarefas = AutocompleteCache(self.carregar_tarefas_autocomplete)
+    
+    async def cog_load(self):
+        self.notificar_prazos.start()
+    
+    def cog_unload(self):
+        self.notificar_prazos.cancel()
     
     @app_commands.command(name="adicionar_tarefa", description="Adicionar uma nova tarefa")
     @app_commands.describe(
@@ -46,38 +131,39 @@ class TarefasCog(commands.Cog):
     ):
         """Adiciona uma nova tarefa à lista do usuário"""
         try:
-            # Verificar limite de tarefas por usuário
-            count = await DatabaseManager.fetch_one(
-                "SELECT COUNT(*) FROM tasks WHERE user_id = ? AND guild_id = ? AND is_completed = 0",
-                (interaction.user.id, interaction.guild_id)
-            )
-            
-            if count and count[0] >= MAX_TASKS_PER_USER:
-                await interaction.response.send_message(
-                    f"{EMOJIS['cross']} Você já atingiu o limite de {MAX_TASKS_PER_USER} tarefas ativas!",
-                    ephemeral=True
-                )
-                return
-            
             # Calcular data de vencimento se fornecida
             due_date = None
             if prazo:
                 due_date = datetime.now() + timedelta(days=prazo)
             
-            # Adicionar tarefa ao banco
+            # Adicionar tarefa ao banco, verificando o limite de tarefas ativas na mesma instrução
+            # (task_counters é mantido por triggers, sem contar as tarefas a cada inserção)
             cursor = await DatabaseManager.execute_query(
                 '''INSERT INTO tasks (user_id, guild_id, title, description, priority, due_date)
-                   VALUES (?, ?, ?, ?, ?, ?)''',
+                   SELECT ?, ?, ?, ?, ?, ?
+                   WHERE COALESCE(
+                       (SELECT active_count FROM task_counters WHERE user_id = ? AND guild_id = ?), 0
+                   ) < ?''',
                 (
                     interaction.user.id,
                     interaction.guild_id,
                     titulo,
                     descricao,
                     prioridade,
-                    due_date
+                    to_epoch(due_date),
+                    interaction.user.id,
+                    interaction.guild_id,
+                    MAX_TASKS_PER_USER
                 )
             )
             
+            if cursor.rowcount == 0:
+                await interaction.response.send_message(
+                    f"{EMOJIS['cross']} Você já atingiu o limite de {MAX_TASKS_PER_USER} tarefas ativas!",
+                    ephemeral=True
+                )
+                return
+            
             task_id = cursor.lastrowid
             
             # Criar embed de confirmação
@@ -110,6 +196,7 @@ class TarefasCog(commands.Cog):
             
             await interaction.response.send_message(embed=embed)
             
+            self.cache_tarefas.invalidate((interaction.user.id, interaction.guild_id))
             logger.info(f"Tarefa {task_id} criada por {interaction.user}")
             
         except Exception as e:
@@ -144,25 +231,12 @@ class TarefasCog(commands.Cog):
     ):
         """Mostra as tarefas do usuário"""
         try:
-            # Construir query baseada nos filtros
-            query = '''SELECT id, title, description, priority, due_date, is_completed, created_at 
-                       FROM tasks WHERE user_id = ? AND guild_id = ?'''
-            params = [interaction.user.id, interaction.guild_id]
-            
-            if status == "pending":
-                query += " AND is_completed = 0"
-            elif status == "completed":
-                query += " AND is_completed = 1"
-            
-            if prioridade:
-                query += " AND priority = ?"
-                params.append(prioridade)
+            filtros = (interaction.user.id, interaction.guild_id, status, prioridade)
             
-            query += " ORDER BY priority ASC, due_date ASC, created_at DESC"
+            # Estatísticas por agregação, sem carregar as tarefas
+            total, concluidas = await self.contar_tarefas(*filtros)
             
-            tarefas = await DatabaseManager.fetch_all(query, params)
-            
-            if not tarefas:
+            if not total:
                 status_text = {
                     "pending": "pendentes",
                     "completed": "concluídas", 
@@ -177,51 +251,193 @@ class TarefasCog(commands.Cog):
                 await interaction.response.send_message(embed=embed, ephemeral=True)
                 return
             
-            # Criar embed com as tarefas
+            view = PaginasTarefas(self, filtros, (total, concluidas))
+            await view.carregar_pagina()
+            
+            await interaction.response.send_message(embed=view.criar_embed(), view=view, ephemeral=True)
+            
+        except Exception as e:
+            logger.error(f"Erro ao buscar tarefas: {e}")
+            await interaction.response.send_message(
+                f"{EMOJIS['cross']} Erro ao buscar tarefas: {str(e)}",
+                ephemeral=True
+            )
+    
+    def filtro_tarefas(self, user_id, guild_id, status, prioridade):
+        """Cláusula WHERE e parâmetros dos filtros de /minhas_tarefas"""
+        where = "user_id = ? AND guild_id = ?"
+        params = [user_id, guild_id]
+        
+        if status == "pending":
+            where += " AND is_completed = 0"
+        elif status == "completed":
+            where += " AND is_completed = 1"
+        
+        if prioridade:
+            where += " AND priority = ?"
+            params.append(prioridade)
+        
+        return where, params
+    
+    async def contar_tarefas(self, user_id, guild_id, status, prioridade):
+        """Retorna (total, concluídas) das tarefas que atendem aos filtros"""
+        where, params = self.filtro_tarefas(user_id, guild_id, status, prioridade)
+        total, concluidas = await DatabaseManager.fetch_one(
+            f"SELECT COUNT(*), COALESCE(SUM(is_completed), 0) FROM tasks WHERE {where}",
+            params
+        )
+        return total, concluidas
+    
+    async def buscar_pagina(self, user_id, guild_id, status, prioridade, cursor=None):
+        """
+        Busca uma página de tarefas a partir do cursor (as chaves da última tarefa da página
+        anterior), na ordem (priority, due_key, recency_key): prioridade, prazo com as tarefas
+        sem prazo antes e as mais recentes antes. O cursor é uma comparação de row value que
+        o índice idx_tasks_user_page(_all) busca direto, então toda página custa o mesmo.
+        Retorna as tarefas da página e o cursor da próxima página (None se for a última).
+        """
+        where, params = self.filtro_tarefas(user_id, guild_id, status, prioridade)
+        
+        # Com a prioridade fixada no filtro, ela sai das chaves de ordem e do cursor
+        chaves = ["due_key", "recency_key"] if prioridade else ["priority", "due_key", "recency_key"]
+        
+        if cursor is not None:
+            where += f" AND ({', '.join(chaves)}) > ({', '.join('?' * len(chaves))})"
+            params += list(cursor[-len(chaves):])
+        
+        tarefas = await DatabaseManager.fetch_all(
+            f'''SELECT id, title, description, priority, due_date, is_completed, created_at, due_key, recency_key
+                FROM tasks WHERE {where}
+                ORDER BY {', '.join(chaves)}
+                LIMIT ?''',
+            params + [TAREFAS_POR_PAGINA + 1]
+        )
+        
+        pagina = [tarefa[:7] for tarefa in tarefas[:TAREFAS_POR_PAGINA]]
+        proximo = None
+        if len(tarefas) > TAREFAS_POR_PAGINA:
+            ultima = tarefas[TAREFAS_POR_PAGINA - 1]
+            proximo = (ultima[3], ultima[7], ultima[8])  # priority, due_key, recency_key
+        
+        return pagina, proximo
+    
+    def criar_embed_tarefas(self, tarefas, estatisticas, pagina, total_paginas):
+        """Cria o embed de uma página de /minhas_tarefas"""
+        embed = discord.Embed(
+            title=f"{EMOJIS['task']} Suas Tarefas",
+            color=DEFAULT_COLOR,
+            timestamp=datetime.now()
+        )
+        
+        # Estatísticas
+        total, concluidas = estatisticas
+        pendentes = total - concluidas
+        
+        embed.add_field(name="📊 Estatísticas", 
+                      value=f"Total: {total} | Pendentes: {pendentes} | Concluídas: {concluidas}",
+                      inline=False)
+        
+        agora = now_epoch()
+        for tarefa in tarefas:
+            task_id, titulo, descricao, priority, due_date, is_completed, created_at = tarefa
+            
+            # Status
+            status_icon = "✅" if is_completed else "⏳"
+            priority_icon = self.priority_emojis[priority]
+            
+            valor = f"{status_icon} {priority_icon} **{titulo}**\n"
+            
+            if descricao:
+                desc_preview = descricao[:50] + "..." if len(descricao) > 50 else descricao
+                valor += f"*{desc_preview}*\n"
+            
+            if due_date and not is_completed:
+                if due_date < agora:
+                    valor += f"🔥 **ATRASADA** - Prazo: <t:{due_date}:R>\n"
+                else:
+                    valor += f"📅 Prazo: <t:{due_date}:R>\n"
+            
+            embed.add_field(
+                name=f"ID: {task_id}",
+                value=valor,
+                inline=False
+            )
+        
+        if total_paginas > 1:
+            embed.set_footer(text=f"Página {pagina} de {total_paginas} • {total} tarefas")
+        
+        return embed
+    
+    @app_commands.command(name="buscar_tarefa", description="Buscar tarefas pelo título e descrição")
+    @app_commands.describe(
+        termos="Palavras a buscar (o início da palavra já basta)",
+        status="Filtrar por status"
+    )
+    @app_commands.choices(status=[
+        app_commands.Choice(name="Pendentes", value="pending"),
+        app_commands.Choice(name="Concluídas", value="completed"),
+        app_commands.Choice(name="Todas", value="all")
+    ])
+    async def buscar_tarefa(
+        self,
+        interaction: discord.Interaction,
+        termos: str,
+        status: str = "all"
+    ):
+        """Busca as tarefas do usuário no índice de texto completo"""
+        try:
+            consulta = consulta_fts(termos)
+            
+            if not consulta:
+                await interaction.response.send_message(
+                    f"{EMOJIS['cross']} Informe ao menos uma palavra para buscar!",
+                    ephemeral=True
+                )
+                return
+            
+            query = '''SELECT t.id, t.priority, t.is_completed,
+                              highlight(tasks_fts, 0, '**', '**'),
+                              snippet(tasks_fts, 1, '**', '**', '…', 12)
+                       FROM tasks_fts
+                       JOIN tasks t ON t.id = tasks_fts.rowid
+                       WHERE tasks_fts MATCH ? AND t.user_id = ? AND t.guild_id = ?'''
+            params = [consulta, interaction.user.id, interaction.guild_id]
+            
+            if status == "pending":
+                query += " AND t.is_completed = 0"
+            elif status == "completed":
+                query += " AND t.is_completed = 1"
+            
+            # Relevância BM25, com o título pesando mais que a descrição
+            query += " ORDER BY bm25(tasks_fts, 10.0, 1.0) LIMIT ?"
+            params.append(RESULTADOS_BUSCA)
+            
+            resultados = await DatabaseManager.fetch_all(query, params)
+            
+            if not resultados:
+                embed = discord.Embed(
+                    title=f"{EMOJIS['info']} Buscar Tarefas",
+                    description=f"Nenhuma tarefa encontrada para **{termos}**.",
+                    color=DEFAULT_COLOR
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            
             embed = discord.Embed(
-                title=f"{EMOJIS['task']} Suas Tarefas",
+                title=f"{EMOJIS['task']} Resultados para \"{termos}\"",
                 color=DEFAULT_COLOR,
                 timestamp=datetime.now()
             )
             
-            # Estatísticas
-            total = len(tarefas)
-            concluidas = sum(1 for t in tarefas if t[5])  # is_completed
-            pendentes = total - concluidas
-            
-            embed.add_field(name="📊 Estatísticas", 
-                          value=f"Total: {total} | Pendentes: {pendentes} | Concluídas: {concluidas}",
-                          inline=False)
-            
-            # Mostrar até 10 tarefas
-            for i, tarefa in enumerate(tarefas[:10], 1):
-                task_id, titulo, descricao, priority, due_date, is_completed, created_at = tarefa
-                
-                # Status
+            for task_id, priority, is_completed, titulo, trecho in resultados:
                 status_icon = "✅" if is_completed else "⏳"
-                priority_icon = self.priority_emojis[priority]
-                
-                valor = f"{status_icon} {priority_icon} **{titulo}**\n"
+                valor = f"{status_icon} {self.priority_emojis[priority]} {titulo}"
+                if trecho:
+                    valor += f"\n*{trecho}*"
                 
-                if descricao:
-                    desc_preview = descricao[:50] + "..." if len(descricao) > 50 else descricao
-                    valor += f"*{desc_preview}*\n"
-                
-                if due_date and not is_completed:
-                    due_datetime = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                    if due_datetime < datetime.now():
-                        valor += f"🔥 **ATRASADA** - Prazo: <t:{int(due_datetime.timestamp())}:R>\n"
-                    else:
-                        valor += f"📅 Prazo: <t:{int(due_datetime.timestamp())}:R>\n"
-                
-                embed.add_field(
-                    name=f"ID: {task_id}",
-                    value=valor,
-                    inline=False
-                )
+                embed.add_field(name=f"ID: {task_id}", value=valor[:1024], inline=False)
             
-            if len(tarefas) > 10:
-                embed.set_footer(text=f"Mostrando 10 de {len(tarefas)} tarefas")
+            embed.set_footer(text=f"{len(resultados)} resultado(s) por relevância")
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
@@ -237,33 +453,34 @@ class TarefasCog(commands.Cog):
     async def concluir_tarefa(self, interaction: discord.Interaction, tarefa_id: int):
         """Marca uma tarefa como concluída"""
         try:
-            # Verificar se a tarefa existe e pertence ao usuário
-            tarefa = await DatabaseManager.fetch_one(
-                '''SELECT title, is_completed FROM tasks 
-                   WHERE id = ? AND user_id = ? AND guild_id = ?''',
-                (tarefa_id, interaction.user.id, interaction.guild_id)
+            # Marcar como concluída em uma única instrução: nenhuma linha = não encontrada;
+            # completed_at diferente do informado = já estava concluída
+            agora = now_epoch()
+            tarefas = await DatabaseManager.execute_returning(
+                '''UPDATE tasks
+                   SET is_completed = 1,
+                       completed_at = CASE WHEN is_completed = 0 THEN ? ELSE completed_at END
+                   WHERE id = ? AND user_id = ? AND guild_id = ?
+                   RETURNING title, completed_at IS ?''',
+                (agora, tarefa_id, interaction.user.id, interaction.guild_id, agora)
             )
             
-            if not tarefa:
+            if not tarefas:
                 await interaction.response.send_message(
                     f"{EMOJIS['cross']} Tarefa não encontrada!",
                     ephemeral=True
                 )
                 return
             
-            if tarefa[1]:  # is_completed
+            tarefa = tarefas[0]
+            
+            if not tarefa[1]:  # já estava concluída
                 await interaction.response.send_message(
                     f"{EMOJIS['warning']} Esta tarefa já está concluída!",
                     ephemeral=True
                 )
                 return
             
-            # Marcar como concluída
-            await DatabaseManager.execute_query(
-                "UPDATE tasks SET is_completed = 1, completed_at = ? WHERE id = ?",
-                (datetime.now(), tarefa_id)
-            )
-            
             embed = discord.Embed(
                 title=f"{EMOJIS['check']} Tarefa Concluída!",
                 description=f"**{tarefa[0]}** foi marcada como concluída.",
@@ -275,6 +492,7 @@ class TarefasCog(commands.Cog):
             
             await interaction.response.send_message(embed=embed)
             
+            self.cache_tarefas.invalidate((interaction.user.id, interaction.guild_id))
             logger.info(f"Tarefa {tarefa_id} concluída por {interaction.user}")
             
         except Exception as e:
@@ -306,41 +524,20 @@ class TarefasCog(commands.Cog):
     ):
         """Edita uma tarefa existente"""
         try:
-            # Verificar se a tarefa existe e pertence ao usuário
-            tarefa = await DatabaseManager.fetch_one(
-                '''SELECT title, description, priority, is_completed FROM tasks 
-                   WHERE id = ? AND user_id = ? AND guild_id = ?''',
-                (tarefa_id, interaction.user.id, interaction.guild_id)
-            )
-            
-            if not tarefa:
-                await interaction.response.send_message(
-                    f"{EMOJIS['cross']} Tarefa não encontrada!",
-                    ephemeral=True
-                )
-                return
-            
-            if tarefa[3]:  # is_completed
-                await interaction.response.send_message(
-                    f"{EMOJIS['warning']} Não é possível editar uma tarefa concluída!",
-                    ephemeral=True
-                )
-                return
-            
             # Preparar valores para atualização
             updates = []
             params = []
             
             if novo_titulo:
-                updates.append("title = ?")
+                updates.append("title")
                 params.append(novo_titulo)
             
             if nova_descricao is not None:  # Permitir string vazia
-                updates.append("description = ?")
+                updates.append("description")
                 params.append(nova_descricao)
             
             if nova_prioridade:
-                updates.append("priority = ?")
+                updates.append("priority")
                 params.append(nova_prioridade)
             
             if not updates:
@@ -350,18 +547,36 @@ class TarefasCog(commands.Cog):
                 )
                 return
             
-            # Atualizar tarefa
-            params.append(tarefa_id)
-            query = f"UPDATE tasks SET {', '.join(updates)} WHERE id = ?"
-            
-            await DatabaseManager.execute_query(query, params)
+            # Atualizar tarefa, verificar dono e estado e ler o resultado em uma única instrução
+            # (tarefas concluídas mantêm os valores atuais)
+            atribuicoes = ', '.join(
+                f"{coluna} = CASE WHEN is_completed = 0 THEN ? ELSE {coluna} END" for coluna in updates
+            )
+            params += [tarefa_id, interaction.user.id, interaction.guild_id]
             
-            # Buscar tarefa atualizada
-            tarefa_atualizada = await DatabaseManager.fetch_one(
-                '''SELECT title, description, priority FROM tasks WHERE id = ?''',
-                (tarefa_id,)
+            tarefas = await DatabaseManager.execute_returning(
+                f'''UPDATE tasks SET {atribuicoes}
+                    WHERE id = ? AND user_id = ? AND guild_id = ?
+                    RETURNING title, description, priority, is_completed''',
+                params
             )
             
+            if not tarefas:
+                await interaction.response.send_message(
+                    f"{EMOJIS['cross']} Tarefa não encontrada!",
+                    ephemeral=True
+                )
+                return
+            
+            tarefa_atualizada = tarefas[0]
+            
+            if tarefa_atualizada[3]:  # is_completed
+                await interaction.response.send_message(
+                    f"{EMOJIS['warning']} Não é possível editar uma tarefa concluída!",
+                    ephemeral=True
+                )
+                return
+            
             embed = discord.Embed(
                 title=f"{EMOJIS['check']} Tarefa Editada",
                 color=DEFAULT_COLOR,
@@ -381,6 +596,7 @@ class TarefasCog(commands.Cog):
             
             await interaction.response.send_message(embed=embed)
             
+            self.cache_tarefas.invalidate((interaction.user.id, interaction.guild_id))
             logger.info(f"Tarefa {tarefa_id} editada por {interaction.user}")
             
         except Exception as e:
@@ -395,25 +611,22 @@ class TarefasCog(commands.Cog):
     async def remover_tarefa(self, interaction: discord.Interaction, tarefa_id: int):
         """Remove uma tarefa"""
         try:
-            # Verificar se a tarefa existe e pertence ao usuário
-            tarefa = await DatabaseManager.fetch_one(
-                '''SELECT title FROM tasks 
-                   WHERE id = ? AND user_id = ? AND guild_id = ?''',
+            # Remover a tarefa somente se pertencer ao usuário
+            tarefas = await DatabaseManager.execute_returning(
+                '''DELETE FROM tasks
+                   WHERE id = ? AND user_id = ? AND guild_id = ?
+                   RETURNING title''',
                 (tarefa_id, interaction.user.id, interaction.guild_id)
             )
             
-            if not tarefa:
+            if not tarefas:
                 await interaction.response.send_message(
                     f"{EMOJIS['cross']} Tarefa não encontrada!",
                     ephemeral=True
                 )
                 return
             
-            # Remover tarefa
-            await DatabaseManager.execute_query(
-                "DELETE FROM tasks WHERE id = ?",
-                (tarefa_id,)
-            )
+            tarefa = tarefas[0]
             
             embed = discord.Embed(
                 title=f"{EMOJIS['check']} Tarefa Removida",
@@ -423,6 +636,7 @@ class TarefasCog(commands.Cog):
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
+            self.cache_tarefas.invalidate((interaction.user.id, interaction.guild_id))
             logger.info(f"Tarefa {tarefa_id} removida por {interaction.user}")
             
         except Exception as e:
@@ -432,5 +646,285 @@ class TarefasCog(commands.Cog):
                 ephemeral=True
             )
 
+    @app_commands.command(name="concluir_tarefas", description="Marcar várias tarefas como concluídas")
+    @app_commands.describe(ids="IDs das tarefas, por exemplo: 3,5,8-12")
+    async def concluir_tarefas(self, interaction: discord.Interaction, ids: str):
+        """Conclui várias tarefas em uma única transação"""
+        try:
+            lista_ids = parse_id_list(ids, MAX_BULK_TASK_IDS)
+            
+            if not lista_ids:
+                await interaction.response.send_message(
+                    f"{EMOJIS['cross']} Lista de IDs inválida! Use o formato `3,5,8-12` "
+                    f"(até {MAX_BULK_TASK_IDS} tarefas).",
+                    ephemeral=True
+                )
+                return
+            
+            placeholders = ', '.join('?' * len(lista_ids))
+            concluidas = await DatabaseManager.execute_returning(
+                f'''UPDATE tasks SET is_completed = 1, completed_at = ?
+                    WHERE user_id = ? AND guild_id = ? AND is_completed = 0
+                      AND id IN ({placeholders})
+                    RETURNING id, title''',
+                [now_epoch(), interaction.user.id, interaction.guild_id] + lista_ids
+            )
+            
+            ignoradas = sorted(set(lista_ids) - {task_id for task_id, _ in concluidas})
+            
+            embed = self.criar_embed_lote(
+                f"{EMOJIS['check']} Tarefas Concluídas",
+                f"**{len(concluidas)}** tarefa(s) marcada(s) como concluída(s).",
+                concluidas,
+                ignoradas,
+                "Não encontradas ou já concluídas"
+            )
+            embed.color = 0x00ff00
+            
+            await interaction.response.send_message(embed=embed)
+            
+            self.cache_tarefas.invalidate((interaction.user.id, interaction.guild_id))
+            logger.info(f"{len(concluidas)} tarefa(s) concluída(s) em lote por {interaction.user}")
+            
+        except Exception as e:
+            logger.error(f"Erro ao concluir tarefas: {e}")
+            await interaction.response.send_message(
+                f"{EMOJIS['cross']} Erro ao concluir tarefas: {str(e)}",
+                ephemeral=True
+            )
+    
+    @app_commands.command(name="remover_tarefas", description="Remover várias tarefas")
+    @app_commands.describe(
+        ids="IDs das tarefas, por exemplo: 3,5,8-12",
+        concluidas_ha_dias="Remover todas as tarefas concluídas há mais de N dias"
+    )
+    async def remover_tarefas(
+        self,
+        interaction: discord.Interaction,
+        ids: str = None,
+        concluidas_ha_dias: app_commands.Range[int, 0] = None
+    ):
+        """Remove várias tarefas (por IDs ou por filtro) em uma única transação"""
+        try:
+            if (ids is None) == (concluidas_ha_dias is None):
+                await interaction.response.send_message(
+                    f"{EMOJIS['cross']} Informe os IDs **ou** o número de dias desde a conclusão!",
+                    ephemeral=True
+                )
+                return
+            
+            query = "DELETE FROM tasks WHERE user_id = ? AND guild_id = ?"
+            params = [interaction.user.id, interaction.guild_id]
+            lista_ids = []
+            
+            if ids is not None:
+                lista_ids = parse_id_list(ids, MAX_BULK_TASK_IDS)
+                
+                if not lista_ids:
+                    await interaction.response.send_message(
+                        f"{EMOJIS['cross']} Lista de IDs inválida! Use o formato `3,5,8-12` "
+                        f"(até {MAX_BULK_TASK_IDS} tarefas).",
+                        ephemeral=True
+                    )
+                    return
+                
+                query += f" AND id IN ({', '.join('?' * len(lista_ids))})"
+                params += lista_ids
+                descricao = "removida(s) da sua lista"
+            else:
+                limite = to_epoch(datetime.now() - timedelta(days=concluidas_ha_dias))
+                query += " AND is_completed = 1 AND completed_at < ?"
+                params.append(limite)
+                descricao = f"concluída(s) há mais de {concluidas_ha_dias} dia(s) removida(s)"
+            
+            removidas = await DatabaseManager.execute_returning(query + " RETURNING id, title", params)
+            
+            ignoradas = sorted(set(lista_ids) - {task_id for task_id, _ in removidas})
+            
+            embed = self.criar_embed_lote(
+                f"{EMOJIS['check']} Tarefas Removidas",
+                f"**{len(removidas)}** tarefa(s) {descricao}.",
+                removidas,
+                ignoradas,
+                "Não encontradas"
+            )
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            
+            self.cache_tarefas.invalidate((interaction.user.id, interaction.guild_id))
+            logger.info(f"{len(removidas)} tarefa(s) removida(s) em lote por {interaction.user}")
+            
+        except Exception as e:
+            logger.error(f"Erro ao remover tarefas: {e}")
+            await interaction.response.send_message(
+                f"{EMOJIS['cross']} Erro ao remover tarefas: {str(e)}",
+                ephemeral=True
+            )
+    
+    def criar_embed_lote(self, titulo, descricao, afetadas, ignoradas, titulo_ignoradas):
+        """Cria o embed de resumo de uma operação em lote"""
+        embed = discord.Embed(
+            title=titulo,
+            description=descricao,
+            color=DEFAULT_COLOR,
+            timestamp=datetime.now()
+        )
+        
+        if afetadas:
+            embed.add_field(
+                name="Tarefas:",
+                value=format_list_items([f"`{task_id}` {nome[:60]}" for task_id, nome in afetadas])[:1024],
+                inline=False
+            )
+        
+        if ignoradas:
+            embed.add_field(
+                name=f"{titulo_ignoradas}:",
+                value=", ".join(map(str, ignoradas))[:1024],
+                inline=False
+            )
+        
+        return embed
+
+    async def buscar_prazos_pendentes(self, agora):
+        """
+        Tarefas com aviso de prazo a enviar, lidas pelo índice parcial idx_tasks_due_notice:
+        sem aviso e vencendo dentro da janela, ou já avisadas como "em breve" e vencidas.
+        """
+        return await DatabaseManager.fetch_all(
+            '''SELECT id, user_id, guild_id, title, due_date, due_notice FROM tasks
+               WHERE is_completed = 0 AND due_date IS NOT NULL AND due_notice < 2
+                 AND due_notice = 0 AND due_date <= ?
+               UNION ALL
+               SELECT id, user_id, guild_id, title, due_date, due_notice FROM tasks
+               WHERE is_completed = 0 AND due_date IS NOT NULL AND due_notice < 2
+                 AND due_notice = 1 AND due_date <= ?
+               ORDER BY due_date
+               LIMIT ?''',
+            (agora + TASK_DUE_SOON_WINDOW, agora, TASK_DUE_BATCH_SIZE)
+        )
+    
+    @tasks.loop(seconds=TASK_DUE_CHECK_INTERVAL)
+    async def notificar_prazos(self):
+        """Task que avisa por DM, uma mensagem por usuário, as tarefas que vencem em breve ou atrasaram"""
+        try:
+            agora = now_epoch()
+            pendentes = await self.buscar_prazos_pendentes(agora)
+            if not pendentes:
+                return
+            
+            # Agrupar por usuário: (user_id, tarefas em breve, tarefas atrasadas)
+            por_usuario = {}
+            for task_id, user_id, guild_id, titulo, due_date, _ in pendentes:
+                em_breve, atrasadas = por_usuario.setdefault(user_id, ([], []))
+                tarefa = (task_id, guild_id, titulo, due_date)
+                (atrasadas if due_date <= agora else em_breve).append(tarefa)
+            
+            avisos = [(user_id, em_breve, atrasadas) for user_id, (em_breve, atrasadas) in por_usuario.items()]
+            resultados = await self.bot.dispatcher.dispatch(
+                avisos,
+                self.enviar_aviso_prazos,
+                channel_of=lambda aviso: aviso[0],
+                due_of=lambda aviso: agora,
+                label="avisos de prazo"
+            )
+            
+            # Marcar só os avisos entregues (ou impossíveis de entregar); falhas tentam de novo
+            marcar_em_breve = []
+            marcar_atrasadas = []
+            for (_, em_breve, atrasadas), ok in zip(avisos, resultados):
+                if ok is True:
+                    marcar_em_breve += [(tarefa[0],) for tarefa in em_breve]
+                    marcar_atrasadas += [tarefa[0] for tarefa in atrasadas]
+            
+            await DatabaseManager.bulk_update(
+                'tasks', f'due_notice = {AVISO_ATRASADA}', ids=marcar_atrasadas,
+                row_query=f"UPDATE tasks SET due_notice = {AVISO_EM_BREVE} WHERE id = ? AND due_notice = {AVISO_NENHUM}",
+                rows=marcar_em_breve
+            )
+            
+            logger.info(
+                f"Avisos de prazo: {len(marcar_em_breve)} em breve e "
+                f"{len(marcar_atrasadas)} atrasada(s) para {len(avisos)} usuário(s)"
+            )
+            
+        except Exception as e:
+            logger.error(f"Erro ao notificar prazos de tarefas: {e}")
+    
+    @notificar_prazos.before_loop
+    async def before_notificar_prazos(self):
+        await self.bot.wait_until_ready()
+    
+    async def enviar_aviso_prazos(self, aviso):
+        """Envia por DM o aviso de prazos de um usuário, retornando True se ele deve ser marcado"""
+        user_id, em_breve, atrasadas = aviso
+        
+        try:
+            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+            await user.send(embed=self.criar_embed_prazos(em_breve, atrasadas))
+        except (discord.NotFound, discord.Forbidden):
+            # Usuário inexistente ou com DMs fechadas: não adianta tentar de novo
+            logger.warning(f"Não foi possível enviar aviso de prazos para o usuário {user_id}")
+        
+        return True
+    
+    def criar_embed_prazos(self, em_breve, atrasadas):
+        """Cria o embed do aviso de prazos enviado por DM"""
+        embed = discord.Embed(
+            title=f"{EMOJIS['clock']} Prazos das suas tarefas",
+            color=DEFAULT_COLOR,
+            timestamp=datetime.now()
+        )
+        
+        def linhas(tarefas):
+            itens = []
+            for task_id, guild_id, titulo, due_date in tarefas:
+                guild = self.bot.get_guild(guild_id)
+                servidor = f" ({guild.name})" if guild else ""
+                itens.append(f"`{task_id}` {titulo[:60]}{servidor} - <t:{due_date}:R>")
+            return format_list_items(itens)[:1024]
+        
+        if atrasadas:
+            embed.add_field(name="🔥 Atrasadas:", value=linhas(atrasadas), inline=False)
+        
+        if em_breve:
+            embed.add_field(name="📅 Vencem em breve:", value=linhas(em_breve), inline=False)
+        
+        embed.set_footer(text="Use /concluir_tarefa para marcar como concluída")
+        return embed
+    
+    async def carregar_tarefas_autocomplete(self, chave):
+        """Carrega (id, título, concluída) das tarefas do usuário para o autocomplete"""
+        user_id, guild_id = chave
+        return await DatabaseManager.fetch_all(
+            '''SELECT id, title, is_completed FROM tasks
+               WHERE user_id = ? AND guild_id = ?
+               ORDER BY is_completed ASC, id DESC
+               LIMIT 500''',
+            (user_id, guild_id)
+        )
+    
+    @concluir_tarefa.autocomplete('tarefa_id')
+    @editar_tarefa.autocomplete('tarefa_id')
+    async def tarefa_pendente_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Sugere as tarefas pendentes do usuário pelo ID ou pelo título"""
+        try:
+            return await self.cache_tarefas.choices(
+                (interaction.user.id, interaction.guild_id), current,
+                predicate=lambda is_completed: not is_completed
+            )
+        except Exception as e:
+            logger.error(f"Erro no autocomplete de tarefas: {e}")
+            return []
+    
+    @remover_tarefa.autocomplete('tarefa_id')
+    async def tarefa_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Sugere qualquer tarefa do usuário pelo ID ou pelo título"""
+        try:
+            return await self.cache_tarefas.choices((interaction.user.id, interaction.guild_id), current)
+        except Exception as e:
+            logger.error(f"Erro no autocomplete de tarefas: {e}")
+            return []
+
 async def setup(bot):
     await bot.add_cog(TarefasCog(bot))
@@ -32,14 +32,66 @@ EMOJIS = {
     'message': '💬'
 }
 
+# Cache de mensagens do discord.py (None desativa): as enquetes usam eventos "raw"
+# e não precisam de mensagens em cache
+MESSAGE_CACHE_SIZE = None
+
 # Configurações de limite
 MAX_POLL_OPTIONS = 10
 MAX_REMINDER_DAYS = 365
 MAX_TASKS_PER_USER = 50
+MAX_BULK_TASK_IDS = 100
 MAX_MESSAGE_LENGTH = 2000
 
+# Envios simultâneos de lembretes/mensagens programadas (cada canal envia um por vez)
+DISPATCH_CONCURRENCY = 10
+# Segundos até uma nova tentativa dos lembretes/mensagens cujo disparo falhou
+DISPATCH_RETRY_DELAY = 60
+
+# Validade (segundos) do cache em memória usado pelo autocomplete de IDs
+AUTOCOMPLETE_CACHE_TTL = 60
+
+# Segundos entre as gravações em lote dos votos de enquetes acumulados em memória
+POLL_VOTE_FLUSH_INTERVAL = 2
+# Intervalo mínimo entre edições da mensagem de uma enquete com a contagem ao vivo
+POLL_EMBED_UPDATE_INTERVAL = 5
+
+# Avisos de prazo das tarefas: intervalo (segundos) entre as varreduras, antecedência
+# (segundos) do aviso de "vence em breve" e máximo de tarefas avisadas por varredura
+TASK_DUE_CHECK_INTERVAL = 300
+TASK_DUE_SOON_WINDOW = 86400
+TASK_DUE_BATCH_SIZE = 1000
+
+# Janela (segundos) em que a primeira atualização dos contadores é espalhada após um reinício
+COUNTDOWN_STARTUP_SPREAD = 300
+# Canais sem acesso ficam este tempo (segundos) sem edições de contadores;
+# após este número de falhas seguidas os contadores do canal são desativados
+COUNTDOWN_FAILURE_BACKOFF = 3600
+COUNTDOWN_MAX_FAILURES = 3
+
 # Configurações de banco de dados
 DB_CONFIG = {
     'timeout': 30,
     'check_same_thread': False
 }
+
+# Perfil de armazenamento aplicado a cada conexão aberta (PRAGMAs do SQLite)
+DB_PROFILE = {
+    'journal_mode': 'WAL',        # Leitores não bloqueiam atrás das escritas
+    'synchronous': 'NORMAL',      # Seguro em WAL, sem fsync a cada commit
+    'cache_size': -20000,         # Valor negativo = KiB (~20 MB por conexão)
+    'mmap_size': 134217728,       # 128 MB de leitura mapeada em memória
+    'temp_store': 'MEMORY',
+    'busy_timeout': 30000         # Milissegundos esperando um lock antes de falhar
+}
+
+# Intervalo (em segundos) e modo do checkpoint periódico do WAL
+DB_WAL_CHECKPOINT_INTERVAL = 300
+DB_WAL_CHECKPOINT_MODE = 'PASSIVE'
+
+# Número de conexões mantidas abertas no pool do DatabaseManager
+DB_POOL_SIZE = 5
+
+# Escritas que chegam dentro desta janela (em segundos) são gravadas em um único commit
+DB_WRITE_BATCH_WINDOW = 0.005
+DB_WRITE_BATCH_SIZE = 500
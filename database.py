@@ -2,15 +2,258 @@ import sqlite3
 import aiosqlite
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
-from config import DATABASE_PATH, DB_CONFIG
+from config import (
+    DATABASE_PATH, DB_CONFIG, DB_PROFILE, DB_POOL_SIZE,
+    DB_WRITE_BATCH_WINDOW, DB_WRITE_BATCH_SIZE, DB_WAL_CHECKPOINT_MODE
+)
 
 logger = logging.getLogger(__name__)
 
+# Máximo de ids por cláusula IN (limite de parâmetros de versões antigas do SQLite)
+BULK_CHUNK_SIZE = 500
+
+def to_epoch(dt):
+    """Converte um datetime no inteiro (segundos desde a época) gravado nas colunas de data"""
+    if dt is None:
+        return None
+    return int(dt.timestamp())
+
+def from_epoch(value):
+    """Converte o inteiro gravado nas colunas de data de volta em datetime local"""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value)
+
+def now_epoch():
+    """Instante atual no formato das colunas de data"""
+    return to_epoch(datetime.now())
+
+def _epoch_from_text(table, column):
+    """Converte datas em texto ISO (hora local), formato antigo, em segundos desde a época"""
+    return (f"UPDATE {table} SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER) "
+            f"WHERE typeof({column}) = 'text'")
+
+async def apply_profile(db, profile=DB_PROFILE):
+    """Aplica os PRAGMAs do perfil de armazenamento a uma conexão"""
+    for pragma, value in profile.items():
+        await db.execute(f"PRAGMA {pragma} = {value}")
+
+async def connect(path=DATABASE_PATH, **kwargs):
+    """Abre uma conexão já configurada com o perfil de armazenamento"""
+    db = await aiosqlite.connect(path, **DB_CONFIG, **kwargs)
+    try:
+        await apply_profile(db)
+    except Exception:
+        await db.close()
+        raise
+    return db
+
+@asynccontextmanager
+async def open_connection(path=DATABASE_PATH, **kwargs):
+    """Abre uma conexão configurada e a fecha ao sair do bloco"""
+    db = await connect(path, **kwargs)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+# Migrações de esquema: (versão, descrição, comandos), aplicadas em ordem
+MIGRATIONS = [
+    (1, "Índices para as consultas frequentes dos cogs", [
+        # verificar_lembretes: remind_at <= ? AND is_sent = 0
+        '''CREATE INDEX IF NOT EXISTS idx_reminders_due
+           ON reminders (remind_at) WHERE is_sent = 0''',
+        # meus_lembretes: user_id = ? AND guild_id = ? AND is_sent = 0 ORDER BY remind_at
+        '''CREATE INDEX IF NOT EXISTS idx_reminders_user_pending
+           ON reminders (user_id, guild_id, remind_at) WHERE is_sent = 0''',
+        # verificar_mensagens: send_at <= ? AND is_sent = 0
+        '''CREATE INDEX IF NOT EXISTS idx_scheduled_due
+           ON scheduled_messages (send_at) WHERE is_sent = 0''',
+        # mensagens_agendadas: guild_id = ? AND is_sent = 0 ORDER BY send_at
+        '''CREATE INDEX IF NOT EXISTS idx_scheduled_guild_pending
+           ON scheduled_messages (guild_id, send_at) WHERE is_sent = 0''',
+        # on_reaction_add: SELECT id, options ... WHERE message_id = ? AND is_active = 1
+        '''CREATE INDEX IF NOT EXISTS idx_polls_message
+           ON polls (message_id, is_active, options)''',
+        # adicionar_tarefa / minhas_tarefas: (user_id, guild_id, is_completed) ORDER BY priority, due_date
+        '''CREATE INDEX IF NOT EXISTS idx_tasks_user_status
+           ON tasks (user_id, guild_id, is_completed, priority, due_date)''',
+        # atualizar_contadores: is_active = 1
+        '''CREATE INDEX IF NOT EXISTS idx_countdowns_active
+           ON countdowns (target_date) WHERE is_active = 1''',
+        # meus_contadores: author_id = ? AND guild_id = ? AND is_active = 1 ORDER BY target_date
+        '''CREATE INDEX IF NOT EXISTS idx_countdowns_author_active
+           ON countdowns (author_id, guild_id, target_date) WHERE is_active = 1'''
+    ]),
+    (2, "Datas armazenadas como inteiros (segundos desde a época)", [
+        _epoch_from_text('reminders', 'remind_at'),
+        _epoch_from_text('scheduled_messages', 'send_at'),
+        _epoch_from_text('countdowns', 'target_date'),
+        _epoch_from_text('tasks', 'due_date'),
+        _epoch_from_text('tasks', 'completed_at'),
+        _epoch_from_text('polls', 'expires_at')
+    ]),
+    (3, "Índice das enquetes com prazo de encerramento", [
+        # Carga do agendador: is_active = 1 AND expires_at IS NOT NULL
+        '''CREATE INDEX IF NOT EXISTS idx_polls_expiring
+           ON polls (expires_at) WHERE is_active = 1 AND expires_at IS NOT NULL'''
+    ]),
+    (4, "Modo de votação das enquetes (reações ou botões)", [
+        "ALTER TABLE polls ADD COLUMN vote_mode TEXT NOT NULL DEFAULT 'reactions'"
+    ]),
+    (5, "Quadros de contadores (uma mensagem por canal)", [
+        '''CREATE TABLE IF NOT EXISTS countdown_boards (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               guild_id INTEGER NOT NULL,
+               channel_id INTEGER NOT NULL,
+               message_id INTEGER NOT NULL,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               is_active BOOLEAN DEFAULT 1
+           )''',
+        # No máximo um quadro ativo por canal
+        '''CREATE UNIQUE INDEX IF NOT EXISTS idx_countdown_boards_channel
+           ON countdown_boards (channel_id) WHERE is_active = 1''',
+        "ALTER TABLE countdowns ADD COLUMN board_id INTEGER REFERENCES countdown_boards (id)",
+        # atualizar_quadro: board_id = ? AND is_active = 1 ORDER BY target_date
+        '''CREATE INDEX IF NOT EXISTS idx_countdowns_board
+           ON countdowns (board_id, target_date) WHERE is_active = 1'''
+    ]),
+    (6, "Índices na ordem de paginação de minhas_tarefas", [
+        # minhas_tarefas (pendentes/concluídas): páginas por cursor em
+        # (priority, due_date, created_at DESC, id DESC); substitui idx_tasks_user_status
+        '''CREATE INDEX IF NOT EXISTS idx_tasks_user_page
+           ON tasks (user_id, guild_id, is_completed, priority, due_date, created_at DESC, id DESC)''',
+        # minhas_tarefas (todas): mesma ordem sem filtrar por status
+        '''CREATE INDEX IF NOT EXISTS idx_tasks_user_page_all
+           ON tasks (user_id, guild_id, priority, due_date, created_at DESC, id DESC)''',
+        "DROP INDEX IF EXISTS idx_tasks_user_status"
+    ]),
+    (7, "Busca de texto completo nas tarefas (FTS5)", [
+        # Índice externo: o texto fica só em tasks, o FTS guarda apenas os termos
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+               title, description,
+               content='tasks', content_rowid='id',
+               tokenize='unicode61 remove_diacritics 2'
+           )''',
+        '''CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+               INSERT INTO tasks_fts (rowid, title, description)
+               VALUES (new.id, new.title, new.description);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+               INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+               VALUES ('delete', old.id, old.title, old.description);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+               INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+               VALUES ('delete', old.id, old.title, old.description);
+               INSERT INTO tasks_fts (rowid, title, description)
+               VALUES (new.id, new.title, new.description);
+           END''',
+        # Indexar as tarefas que já existem
+        "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"
+    ]),
+    (8, "Contadores de tarefas ativas por usuário, mantidos por triggers", [
+        '''CREATE TABLE IF NOT EXISTS task_counters (
+               user_id INTEGER NOT NULL,
+               guild_id INTEGER NOT NULL,
+               active_count INTEGER NOT NULL DEFAULT 0,
+               PRIMARY KEY (user_id, guild_id)
+           ) WITHOUT ROWID''',
+        '''CREATE TRIGGER IF NOT EXISTS task_counters_insert AFTER INSERT ON tasks
+           WHEN new.is_completed = 0 BEGIN
+               INSERT INTO task_counters (user_id, guild_id, active_count)
+               VALUES (new.user_id, new.guild_id, 1)
+               ON CONFLICT (user_id, guild_id) DO UPDATE SET active_count = active_count + 1;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS task_counters_delete AFTER DELETE ON tasks
+           WHEN old.is_completed = 0 BEGIN
+               UPDATE task_counters SET active_count = active_count - 1
+               WHERE user_id = old.user_id AND guild_id = old.guild_id;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS task_counters_update AFTER UPDATE OF is_completed, user_id, guild_id ON tasks
+           BEGIN
+               UPDATE task_counters SET active_count = active_count - 1
+               WHERE old.is_completed = 0 AND user_id = old.user_id AND guild_id = old.guild_id;
+               INSERT INTO task_counters (user_id, guild_id, active_count)
+               SELECT new.user_id, new.guild_id, 1 WHERE new.is_completed = 0
+               ON CONFLICT (user_id, guild_id) DO UPDATE SET active_count = active_count + 1;
+           END''',
+        # Contagem inicial a partir das tarefas que já existem
+        '''INSERT INTO task_counters (user_id, guild_id, active_count)
+           SELECT user_id, guild_id, COUNT(*) FROM tasks
+           WHERE is_completed = 0
+           GROUP BY user_id, guild_id'''
+    ]),
+    (9, "Avisos de prazo das tarefas", [
+        # Último aviso enviado: 0 = nenhum, 1 = vence em breve, 2 = atrasada
+        "ALTER TABLE tasks ADD COLUMN due_notice INTEGER NOT NULL DEFAULT 0",
+        # Tarefas que já estavam atrasadas não geram avisos retroativos
+        '''UPDATE tasks SET due_notice = 2
+           WHERE is_completed = 0 AND due_date <= CAST(strftime('%s', 'now') AS INTEGER)''',
+        # notificar_prazos: só as tarefas pendentes com prazo que ainda têm aviso a receber;
+        # concluídas e já avisadas saem do índice
+        '''CREATE INDEX IF NOT EXISTS idx_tasks_due_notice
+           ON tasks (due_notice, due_date)
+           WHERE is_completed = 0 AND due_date IS NOT NULL AND due_notice < 2'''
+    ]),
+    (10, "Chaves de paginação de minhas_tarefas em uma única direção", [
+        # A ordem (priority, due_date com nulos antes, mais recentes antes) vira colunas
+        # crescentes e não nulas, para o cursor ser uma comparação de row value que o
+        # índice consegue buscar. Os ids seguem a ordem de criação, então -id equivale a
+        # created_at DESC, id DESC.
+        "ALTER TABLE tasks ADD COLUMN due_key INTEGER GENERATED ALWAYS AS (COALESCE(due_date, 0)) VIRTUAL",
+        "ALTER TABLE tasks ADD COLUMN recency_key INTEGER GENERATED ALWAYS AS (-id) VIRTUAL",
+        "DROP INDEX IF EXISTS idx_tasks_user_page",
+        "DROP INDEX IF EXISTS idx_tasks_user_page_all",
+        # minhas_tarefas (pendentes/concluídas)
+        '''CREATE INDEX IF NOT EXISTS idx_tasks_user_page
+           ON tasks (user_id, guild_id, is_completed, priority, due_key, recency_key)''',
+        # minhas_tarefas (todas)
+        '''CREATE INDEX IF NOT EXISTS idx_tasks_user_page_all
+           ON tasks (user_id, guild_id, priority, due_key, recency_key)'''
+    ])
+]
+
+async def run_migrations(db):
+    """Aplica as migrações pendentes, registrando cada versão em schema_version"""
+    await db.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    await db.commit()
+    
+    cursor = await db.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    (current_version,) = await cursor.fetchone()
+    
+    for version, description, statements in MIGRATIONS:
+        if version <= current_version:
+            continue
+        
+        # Cada migração é aplicada por inteiro ou não é aplicada
+        await db.execute("BEGIN")
+        try:
+            for statement in statements:
+                await db.execute(statement)
+            await db.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        
+        logger.info(f"Migração {version} aplicada: {description}")
+
 async def init_database():
     """Inicializa o banco de dados e cria as tabelas necessárias"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH, **DB_CONFIG) as db:
+        async with open_connection() as db:
             # Tabela de enquetes
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS polls (
@@ -22,7 +265,7 @@ async def init_database():
                     title TEXT NOT NULL,
                     options TEXT NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP,
+                    expires_at INTEGER, -- segundos desde a época
                     is_active BOOLEAN DEFAULT 1
                 )
             ''')
@@ -48,7 +291,7 @@ async def init_database():
                     guild_id INTEGER, -- REMOVIDO: NOT NULL para permitir lembretes em DMs
                     channel_id INTEGER NOT NULL,
                     message TEXT NOT NULL,
-                    remind_at TIMESTAMP NOT NULL,
+                    remind_at INTEGER NOT NULL, -- segundos desde a época
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     is_sent BOOLEAN DEFAULT 0
                 )
@@ -62,7 +305,7 @@ async def init_database():
                     channel_id INTEGER NOT NULL,
                     author_id INTEGER NOT NULL,
                     message TEXT NOT NULL,
-                    send_at TIMESTAMP NOT NULL,
+                    send_at INTEGER NOT NULL, -- segundos desde a época
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     is_sent BOOLEAN DEFAULT 0,
                     repeat_interval TEXT
@@ -78,7 +321,7 @@ async def init_database():
                     message_id INTEGER NOT NULL,
                     author_id INTEGER NOT NULL,
                     title TEXT NOT NULL,
-                    target_date TIMESTAMP NOT NULL,
+                    target_date INTEGER NOT NULL, -- segundos desde a época
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     is_active BOOLEAN DEFAULT 1
                 )
@@ -94,42 +337,371 @@ async def init_database():
                     description TEXT,
                     is_completed BOOLEAN DEFAULT 0,
                     priority INTEGER DEFAULT 1,
-                    due_date TIMESTAMP,
+                    due_date INTEGER, -- segundos desde a época
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TIMESTAMP
+                    completed_at INTEGER -- segundos desde a época
                 )
             ''')
             
             await db.commit()
+            
+            # Aplicar migrações de esquema pendentes
+            await run_migrations(db)
+            
             logger.info("Banco de dados inicializado com sucesso")
             
     except Exception as e:
         logger.error(f"Erro ao inicializar banco de dados: {e}")
         raise
 
+class ConnectionPool:
+    """Pool de conexões persistentes com o banco de dados"""
+    
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self._connections = []
+        self._available = asyncio.Queue()
+    
+    async def open(self):
+        """Abre todas as conexões do pool"""
+        for _ in range(self.size):
+            db = await connect(self.path)
+            self._connections.append(db)
+            self._available.put_nowait(db)
+        logger.info(f"Pool de conexões aberto com {self.size} conexão(ões)")
+    
+    async def close(self):
+        """Fecha todas as conexões do pool"""
+        for db in self._connections:
+            try:
+                await db.close()
+            except Exception as e:
+                logger.error(f"Erro ao fechar conexão do pool: {e}")
+        self._connections.clear()
+        logger.info("Pool de conexões fechado")
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Empresta uma conexão do pool, devolvendo-a ao final"""
+        db = await self._available.get()
+        try:
+            yield db
+        finally:
+            self._available.put_nowait(db)
+
+class WriteResult:
+    """Resultado de uma operação de escrita (compatível com o uso de cursor.lastrowid)"""
+    
+    __slots__ = ('lastrowid', 'rowcount', 'rows')
+    
+    def __init__(self, lastrowid=None, rowcount=-1, rows=None):
+        self.lastrowid = lastrowid
+        self.rowcount = rowcount
+        # Linhas devolvidas por RETURNING (da última operação que devolveu linhas)
+        self.rows = rows if rows is not None else []
+
+class DatabaseWriter:
+    """Escritor único que agrupa as escritas recebidas em uma mesma transação (group commit)"""
+    
+    def __init__(self, path, window=DB_WRITE_BATCH_WINDOW, max_batch=DB_WRITE_BATCH_SIZE):
+        self.path = path
+        self.window = window
+        self.max_batch = max_batch
+        self._db = None
+        self._queue = asyncio.Queue()
+        self._task = None
+    
+    async def start(self):
+        """Abre a conexão de escrita e inicia a tarefa do escritor"""
+        # Sem transações implícitas: o escritor controla BEGIN/COMMIT de cada lote
+        self._db = await connect(self.path, isolation_level=None)
+        self._task = asyncio.create_task(self._run(), name="database-writer")
+        logger.info("Escritor do banco de dados iniciado")
+    
+    async def stop(self):
+        """Processa as escritas pendentes e encerra o escritor"""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        try:
+            await self._task
+        finally:
+            self._task = None
+            await self._db.close()
+            self._db = None
+            logger.info("Escritor do banco de dados encerrado")
+    
+    def submit(self, operations):
+        """Enfileira uma lista de operações (query, params, many) para a mesma transação"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operations, future))
+        return future
+    
+    async def _run(self):
+        """Loop principal: junta as escritas de uma janela curta e faz um único commit"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            
+            batch = [item]
+            deadline = loop.time() + self.window
+            
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    # Escrita isolada não espera a janela; só rajadas são agrupadas
+                    timeout = deadline - loop.time()
+                    if len(batch) == 1 or timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            await self._commit_batch(batch)
+    
+    async def _apply(self, operations):
+        """Executa as operações de um pedido dentro da transação corrente"""
+        result = WriteResult()
+        total = 0
+        
+        for query, params, many in operations:
+            if many:
+                cursor = await self._db.executemany(query, params)
+            elif params:
+                cursor = await self._db.execute(query, params)
+            else:
+                cursor = await self._db.execute(query)
+            
+            # RETURNING: as linhas precisam ser lidas antes do COMMIT
+            if cursor.description is not None:
+                result.rows = await cursor.fetchall()
+            
+            result.lastrowid = cursor.lastrowid
+            if cursor.rowcount > 0:
+                total += cursor.rowcount
+            await cursor.close()
+        
+        result.rowcount = total
+        return result
+    
+    async def _commit_batch(self, batch):
+        """Grava um lote em uma transação, isolando pedidos com erro se necessário"""
+        try:
+            await self._db.execute("BEGIN IMMEDIATE")
+            results = [await self._apply(operations) for operations, _ in batch]
+            await self._db.execute("COMMIT")
+        except Exception as e:
+            await self._rollback()
+            
+            if len(batch) == 1:
+                _, future = batch[0]
+                if not future.done():
+                    future.set_exception(e)
+                return
+            
+            # Um pedido inválido não pode derrubar o lote inteiro: refazer um a um
+            for item in batch:
+                await self._commit_batch([item])
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _rollback(self):
+        try:
+            await self._db.execute("ROLLBACK")
+        except sqlite3.Error:
+            # Nenhuma transação ativa (falha no próprio BEGIN)
+            pass
+
 class DatabaseManager:
     """Gerenciador de operações do banco de dados"""
     
-    @staticmethod
-    async def execute_query(query, params=None):
+    _pool = None
+    _writer = None
+    
+    @classmethod
+    async def open_pool(cls, size=DB_POOL_SIZE):
+        """Abre o pool de conexões compartilhado pelos cogs"""
+        if cls._pool is not None:
+            return
+        pool = ConnectionPool(DATABASE_PATH, size)
+        await pool.open()
+        cls._pool = pool
+    
+    @classmethod
+    async def close_pool(cls):
+        """Fecha o pool de conexões compartilhado"""
+        if cls._pool is None:
+            return
+        pool, cls._pool = cls._pool, None
+        await pool.close()
+    
+    @classmethod
+    async def start_writer(cls):
+        """Inicia o escritor único usado por todas as escritas dos cogs"""
+        if cls._writer is not None:
+            return
+        writer = DatabaseWriter(DATABASE_PATH)
+        await writer.start()
+        cls._writer = writer
+    
+    @classmethod
+    async def stop_writer(cls):
+        """Grava as escritas pendentes e encerra o escritor"""
+        if cls._writer is None:
+            return
+        writer, cls._writer = cls._writer, None
+        await writer.stop()
+    
+    @classmethod
+    @asynccontextmanager
+    async def connection(cls):
+        """Fornece uma conexão do pool (ou uma conexão avulsa se o pool não estiver aberto)"""
+        if cls._pool is not None:
+            async with cls._pool.acquire() as db:
+                yield db
+        else:
+            async with open_connection() as db:
+                yield db
+    
+    @classmethod
+    async def checkpoint(cls, mode=DB_WAL_CHECKPOINT_MODE):
+        """Executa um checkpoint do WAL para que o arquivo não cresça indefinidamente"""
+        try:
+            async with cls.connection() as db:
+                cursor = await db.execute(f"PRAGMA wal_checkpoint({mode})")
+                busy, log_frames, checkpointed = await cursor.fetchone()
+            logger.debug(
+                f"Checkpoint do WAL ({mode}): {checkpointed}/{log_frames} páginas, busy={busy}"
+            )
+            return busy, log_frames, checkpointed
+        except Exception as e:
+            logger.error(f"Erro ao executar checkpoint do WAL: {e}")
+            return None
+    
+    @classmethod
+    async def execute_query(cls, query, params=None):
         """Executa uma query SQL"""
         try:
-            async with aiosqlite.connect(DATABASE_PATH, **DB_CONFIG) as db:
-                if params:
-                    cursor = await db.execute(query, params)
-                else:
-                    cursor = await db.execute(query)
-                await db.commit()
+            if cls._writer is not None:
+                return await cls._writer.submit([(query, params, False)])
+            
+            async with cls.connection() as db:
+                try:
+                    if params:
+                        cursor = await db.execute(query, params)
+                    else:
+                        cursor = await db.execute(query)
+                    await db.commit()
+                except Exception:
+                    # Não devolver a conexão ao pool com transação pendente
+                    await db.rollback()
+                    raise
                 return cursor
         except Exception as e:
             logger.error(f"Erro ao executar query: {e}")
             raise
     
-    @staticmethod
-    async def fetch_one(query, params=None):
-        """Busca um registro"""
+    @classmethod
+    async def execute_returning(cls, query, params=None):
+        """
+        Executa uma escrita com RETURNING e devolve as linhas afetadas.
+        Permite verificar dono, estado e ler o resultado em uma única instrução
+        (lista vazia = nenhuma linha atendeu ao WHERE).
+        """
+        try:
+            if cls._writer is not None:
+                result = await cls._writer.submit([(query, params, False)])
+                return result.rows
+            
+            async with cls.connection() as db:
+                try:
+                    cursor = await db.execute(query, params or ())
+                    rows = await cursor.fetchall()
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+                return rows
+        except Exception as e:
+            logger.error(f"Erro ao executar query com RETURNING: {e}")
+            raise
+    
+    @classmethod
+    async def execute_transaction(cls, operations):
+        """Executa uma lista de operações (query, params, many) em uma única transação"""
+        try:
+            if cls._writer is not None:
+                return await cls._writer.submit(operations)
+            
+            async with cls.connection() as db:
+                result = WriteResult()
+                total = 0
+                try:
+                    for query, params, many in operations:
+                        if many:
+                            cursor = await db.executemany(query, params)
+                        elif params:
+                            cursor = await db.execute(query, params)
+                        else:
+                            cursor = await db.execute(query)
+                        result.lastrowid = cursor.lastrowid
+                        if cursor.rowcount > 0:
+                            total += cursor.rowcount
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+                result.rowcount = total
+                return result
+        except Exception as e:
+            logger.error(f"Erro ao executar transação: {e}")
+            raise
+    
+    @classmethod
+    async def bulk_update(cls, table, set_clause, ids=(), row_query=None, rows=()):
+        """
+        Atualiza vários registros em uma única transação:
+        `set_clause` é aplicado a todos os `ids` com UPDATE ... WHERE id IN (...) e
+        `row_query` é executado com executemany para os valores individuais em `rows`.
+        """
+        operations = []
+        ids = list(ids)
+        
+        for start in range(0, len(ids), BULK_CHUNK_SIZE):
+            chunk = ids[start:start + BULK_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            operations.append(
+                (f"UPDATE {table} SET {set_clause} WHERE id IN ({placeholders})", chunk, False)
+            )
+        
+        if row_query and rows:
+            operations.append((row_query, list(rows), True))
+        
+        if not operations:
+            return WriteResult(rowcount=0)
+        
+        return await cls.execute_transaction(operations)
+    
+    @classmethod
+    async def fetch_one(cls, query, params=None, raise_errors=False):
+        """Busca um registro. Erros retornam None, a menos que `raise_errors` seja verdadeiro"""
         try:
-            async with aiosqlite.connect(DATABASE_PATH, **DB_CONFIG) as db:
+            async with cls.connection() as db:
                 if params:
                     cursor = await db.execute(query, params)
                 else:
@@ -137,13 +709,18 @@ class DatabaseManager:
                 return await cursor.fetchone()
         except Exception as e:
             logger.error(f"Erro ao buscar registro: {e}")
+            if raise_errors:
+                raise
             return None
     
-    @staticmethod
-    async def fetch_all(query, params=None):
-        """Busca todos os registros"""
+    @classmethod
+    async def fetch_all(cls, query, params=None, raise_errors=False):
+        """
+        Busca todos os registros. Erros retornam lista vazia, a menos que `raise_errors`
+        seja verdadeiro (quem precisa distinguir "nenhum registro" de "falha na leitura").
+        """
         try:
-            async with aiosqlite.connect(DATABASE_PATH, **DB_CONFIG) as db:
+            async with cls.connection() as db:
                 if params:
                     cursor = await db.execute(query, params)
                 else:
@@ -151,5 +728,7 @@ class DatabaseManager:
                 return await cursor.fetchall()
         except Exception as e:
             logger.error(f"Erro ao buscar registros: {e}")
+            if raise_errors:
+                raise
             return []
 
@@ -1,10 +1,12 @@
 import os
 import asyncio
 import logging
-from discord.ext import commands
+from discord.ext import commands, tasks
 import discord
-from config import BOT_TOKEN, DATABASE_PATH
-from database import init_database
+from config import BOT_TOKEN, DATABASE_PATH, DB_WAL_CHECKPOINT_INTERVAL, MESSAGE_CACHE_SIZE
+from database import init_database, DatabaseManager
+from utils.scheduler import Scheduler
+from utils.dispatcher import Dispatcher
 
 # Configuração de logging
 logging.basicConfig(
@@ -28,8 +30,15 @@ class ProdutividadeBot(commands.Bot):
         super().__init__(
             command_prefix='!',
             intents=intents,
-            help_command=None
+            help_command=None,
+            max_messages=MESSAGE_CACHE_SIZE
         )
+        
+        # Agendador compartilhado pelos cogs (lembretes, mensagens programadas...)
+        self.scheduler = Scheduler()
+        
+        # Envio concorrente e limitado dos itens vencidos
+        self.dispatcher = Dispatcher()
     
     async def setup_hook(self):
         """Configuração inicial do bot"""
@@ -38,6 +47,14 @@ class ProdutividadeBot(commands.Bot):
         # Inicializar banco de dados
         await init_database()
         
+        # Abrir pool de conexões compartilhado pelos cogs
+        await DatabaseManager.open_pool()
+        await DatabaseManager.start_writer()
+        self.checkpoint_wal.start()
+        
+        # Disparos só começam depois que o bot estiver conectado
+        self.scheduler.start(self.wait_until_ready)
+        
         # Carregar cogs (módulos de funcionalidades)
         cogs_to_load = [
             'cogs.enquetes',
@@ -61,6 +78,21 @@ class ProdutividadeBot(commands.Bot):
         except Exception as e:
             logger.error(f"Erro ao sincronizar comandos: {e}")
     
+    async def close(self):
+        """Encerra o bot e libera as conexões do banco de dados"""
+        self.checkpoint_wal.cancel()
+        try:
+            await super().close()
+        finally:
+            await self.scheduler.stop()
+            await DatabaseManager.stop_writer()
+            await DatabaseManager.close_pool()
+    
+    @tasks.loop(seconds=DB_WAL_CHECKPOINT_INTERVAL)
+    async def checkpoint_wal(self):
+        """Task que faz o checkpoint periódico do WAL"""
+        await DatabaseManager.checkpoint()
+    
     async def on_ready(self):
         """Evento disparado quando o bot está pronto"""
         logger.info(f'{self.user} está online e funcionando!')
@@ -0,0 +1,22 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# O banco dos testes é temporário e precisa ser definido antes de importar config
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(prefix="botprodutividade_tests_"), "test.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+@pytest.fixture
+def banco():
+    """Banco temporário recém-criado, com todas as migrações aplicadas"""
+    for sufixo in ('', '-wal', '-shm'):
+        caminho = database.DATABASE_PATH + sufixo
+        if os.path.exists(caminho):
+            os.remove(caminho)
+    asyncio.run(database.init_database())
+    return database.DATABASE_PATH
@@ -0,0 +1,282 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from config import COUNTDOWN_FAILURE_BACKOFF, DISPATCH_RETRY_DELAY
+from cogs.contadores import ContadoresCog, PLANO_ATUALIZACAO
+from database import DatabaseManager, now_epoch
+from utils.dispatcher import Dispatcher
+from utils.helpers import EMBED_FIELD_NAME_LIMIT, EMBED_TOTAL_LIMIT
+from utils.scheduler import Scheduler
+
+class Relogio:
+    """Relógio controlável do agendador"""
+    def __init__(self, agora):
+        self.agora = agora
+
+    def __call__(self):
+        return self.agora
+
+class CanalFalso:
+    def __init__(self, channel_id, falhas=()):
+        self.id = channel_id
+        self.falhas = list(falhas)   # exceções levantadas pelos próximos envios
+        self.enviados = []
+        self.editados = []
+
+    async def send(self, content=None, embed=None):
+        if self.falhas:
+            raise self.falhas.pop(0)
+        self.enviados.append(embed.title)
+
+    def get_partial_message(self, message_id):
+        async def edit(embed=None):
+            self.editados.append(message_id)
+        return SimpleNamespace(edit=edit)
+
+class BotFalso:
+    def __init__(self, relogio, canal):
+        self.scheduler = Scheduler(clock=relogio)
+        self.dispatcher = Dispatcher()
+        self.canal = canal
+
+    def get_partial_messageable(self, channel_id, guild_id=None):
+        return self.canal
+
+def erro_http(classe, status):
+    return classe(SimpleNamespace(status=status, reason="erro"), "erro")
+
+def prazo(bot, contador_id):
+    entrada = bot.scheduler._entries.get(('countdown', contador_id))
+    return entrada and entrada[0]
+
+async def avancar(bot, relogio, segundos):
+    """Avança o relógio e entrega os itens vencidos aos handlers, como o loop do agendador"""
+    relogio.agora += segundos
+    for kind, ids in bot.scheduler.pop_due().items():
+        await bot.scheduler._handlers[kind](ids)
+
+async def criar_contador(target_date):
+    cursor = await DatabaseManager.execute_query(
+        '''INSERT INTO countdowns (guild_id, channel_id, message_id, author_id, title, target_date)
+           VALUES (1, 10, 100, 1, 'Lançamento', ?)''',
+        (target_date,)
+    )
+    return cursor.lastrowid
+
+async def ativo(contador_id):
+    (is_active,) = await DatabaseManager.fetch_one("SELECT is_active FROM countdowns WHERE id = ?", (contador_id,))
+    return is_active
+
+def montar(canal):
+    relogio = Relogio(now_epoch())
+    bot = BotFalso(relogio, canal)
+    cog = ContadoresCog(bot)
+    bot.scheduler.register('countdown', cog.finalizar_contadores)
+    return relogio, bot, cog
+
+def test_finaliza_no_horario_exato(banco):
+    async def cenario():
+        canal = CanalFalso(10)
+        relogio, bot, cog = montar(canal)
+        alvo = relogio.agora + 3600
+        contador_id = await criar_contador(alvo)
+        bot.scheduler.schedule('countdown', contador_id, alvo)
+
+        await avancar(bot, relogio, 3599)
+        antes = (list(canal.enviados), await ativo(contador_id))
+        await avancar(bot, relogio, 1)
+        return antes, canal.enviados, await ativo(contador_id), bot.scheduler.pending()
+
+    antes, enviados, is_active, pendentes = asyncio.run(cenario())
+    assert antes == ([], 1)
+    assert len(enviados) == 1
+    assert is_active == 0 and pendentes == 0
+
+def test_envio_falho_reagenda_finalizacao(banco):
+    async def cenario():
+        canal = CanalFalso(10, falhas=[erro_http(discord.HTTPException, 503)])
+        relogio, bot, cog = montar(canal)
+        contador_id = await criar_contador(relogio.agora)
+        bot.scheduler.schedule('countdown', contador_id, relogio.agora)
+
+        await avancar(bot, relogio, 0)
+        depois_da_falha = (prazo(bot, contador_id), await ativo(contador_id), list(canal.enviados))
+
+        relogio.agora = now_epoch()
+        await avancar(bot, relogio, DISPATCH_RETRY_DELAY)
+        return depois_da_falha, canal.enviados, await ativo(contador_id)
+
+    (novo_prazo, is_active, enviados), enviados_final, is_active_final = asyncio.run(cenario())
+    assert novo_prazo == pytest.approx(now_epoch() + DISPATCH_RETRY_DELAY, abs=2)
+    assert is_active == 1 and enviados == []
+    assert len(enviados_final) == 1 and is_active_final == 0
+
+def test_canal_sem_permissao_aguarda_backoff(banco):
+    async def cenario():
+        canal = CanalFalso(10, falhas=[erro_http(discord.Forbidden, 403)])
+        relogio, bot, cog = montar(canal)
+        contador_id = await criar_contador(relogio.agora)
+        bot.scheduler.schedule('countdown', contador_id, relogio.agora)
+        await avancar(bot, relogio, 0)
+        return prazo(bot, contador_id), cog.canal_bloqueado(10)
+
+    novo_prazo, bloqueado = asyncio.run(cenario())
+    assert novo_prazo == pytest.approx(now_epoch() + COUNTDOWN_FAILURE_BACKOFF, abs=2)
+    assert bloqueado
+
+def test_leitura_falha_reagenda_atualizacao(banco, monkeypatch):
+    async def falhar(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(DatabaseManager, "fetch_all", falhar)
+    relogio, bot, cog = montar(CanalFalso(10))
+    asyncio.run(cog.atualizar_contadores([1, 2]))
+
+    assert bot.scheduler.pending() == 2
+    for contador_id in (1, 2):
+        entrada = bot.scheduler._entries[('countdown_refresh', contador_id)]
+        assert entrada[0] == pytest.approx(now_epoch() + DISPATCH_RETRY_DELAY, abs=2)
+
+def test_falha_ao_carregar_contadores_impede_o_cog(banco, monkeypatch):
+    async def falhar(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(DatabaseManager, "fetch_all", falhar)
+    bot = BotFalso(Relogio(now_epoch()), CanalFalso(10))
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(ContadoresCog(bot).cog_load())
+    assert bot.scheduler._handlers == {}
+
+def test_proxima_atualizacao_respeita_faixas():
+    cog = ContadoresCog(SimpleNamespace())
+    agora = 1_000_000
+    limites = [faixa[0] for faixa in PLANO_ATUALIZACAO]
+
+    for restante in (30 * 86400, 8 * 86400, 2 * 86400, 86400 + 60, 7200, 3601, 600, 61):
+        alvo = agora + restante
+        proxima = cog.proxima_atualizacao(42, alvo, agora)
+        assert proxima is not None and agora < proxima < alvo
+        # Nunca passa da entrada na faixa seguinte (que muda o formato do texto)
+        limite_atual = next(limite for limite in limites if restante > limite)
+        assert alvo - proxima >= limite_atual
+
+    # No último minuto quem age é a finalização exata, não uma atualização
+    assert cog.proxima_atualizacao(42, agora + 30, agora) is None
+
+class MensagemFalsa:
+    def __init__(self, message_id):
+        self.id = message_id
+        self.apagada = False
+
+    async def delete(self):
+        self.apagada = True
+
+class RespostaFalsa:
+    def __init__(self, interacao):
+        self.interacao = interacao
+        self.enviada = False
+
+    def is_done(self):
+        return self.enviada
+
+    async def send_message(self, content=None, embed=None, ephemeral=False):
+        assert not self.enviada, "interação respondida duas vezes"
+        self.enviada = True
+        # Os dois comandos chegam juntos: ambos respondem antes de gravar o quadro
+        await asyncio.sleep(0)
+
+class InteracaoFalsa:
+    proximo_id = 1000
+
+    def __init__(self):
+        InteracaoFalsa.proximo_id += 1
+        self.mensagem = MensagemFalsa(InteracaoFalsa.proximo_id)
+        self.guild_id = 1
+        self.channel_id = 10
+        self.user = SimpleNamespace(id=1)
+        self.response = RespostaFalsa(self)
+        self.followups = []
+        self.followup = SimpleNamespace(send=self.enviar_followup)
+
+    async def enviar_followup(self, content=None, ephemeral=False):
+        self.followups.append(content)
+
+    async def original_response(self):
+        return self.mensagem
+
+def test_quadro_criado_ao_mesmo_tempo_reaproveita_o_existente(banco):
+    async def cenario():
+        relogio, bot, cog = montar(CanalFalso(10))
+        interacoes = [InteracaoFalsa(), InteracaoFalsa()]
+        alvo = relogio.agora + 86400
+        await asyncio.gather(*(
+            cog.adicionar_ao_quadro(interacao, f"Evento {i}", alvo) for i, interacao in enumerate(interacoes)
+        ))
+        quadros = await DatabaseManager.fetch_all("SELECT id, message_id FROM countdown_boards WHERE is_active = 1")
+        contadores = await DatabaseManager.fetch_all("SELECT board_id, message_id FROM countdowns")
+        return interacoes, quadros, contadores
+
+    interacoes, quadros, contadores = asyncio.run(cenario())
+    assert len(quadros) == 1
+    board_id, message_id = quadros[0]
+    # Os dois contadores ficaram no mesmo quadro e a mensagem duplicada foi apagada
+    assert contadores == [(board_id, message_id)] * 2
+    perdedora = next(i for i in interacoes if i.mensagem.id != message_id)
+    assert perdedora.mensagem.apagada and len(perdedora.followups) == 1
+
+def test_quadro_com_titulos_longos_cabe_no_embed():
+    cog = ContadoresCog(SimpleNamespace())
+    alvo = now_epoch() + 86400
+    embed = cog.criar_embed_quadro([("x" * 1000, alvo + i) for i in range(40)])
+
+    assert len(embed) <= EMBED_TOTAL_LIMIT
+    assert all(len(campo.name) <= EMBED_FIELD_NAME_LIMIT for campo in embed.fields)
+    assert f"Mostrando {len(embed.fields)} de 40" in embed.footer.text
+
+def test_leitura_falha_nao_esvazia_o_quadro(banco, monkeypatch):
+    async def cenario():
+        canal = CanalFalso(10)
+        relogio, bot, cog = montar(canal)
+        bot.scheduler.register('countdown_board', cog.atualizar_quadros)
+        cursor = await DatabaseManager.execute_query(
+            "INSERT INTO countdown_boards (guild_id, channel_id, message_id) VALUES (1, 10, 500)"
+        )
+        board_id = cursor.lastrowid
+        for i in range(3):
+            contador_id = await criar_contador(relogio.agora + 86400 * (i + 1))
+            await DatabaseManager.execute_query(
+                "UPDATE countdowns SET board_id = ? WHERE id = ?", (board_id, contador_id)
+            )
+
+        # A leitura dos contadores do quadro falha uma vez
+        fetch_all = DatabaseManager.fetch_all
+        falhas = [sqlite3.OperationalError("database is locked")]
+
+        async def fetch_all_falho(*args, **kwargs):
+            if falhas:
+                raise falhas.pop()
+            return await fetch_all(*args, **kwargs)
+        monkeypatch.setattr(DatabaseManager, "fetch_all", fetch_all_falho)
+
+        await cog.atualizar_quadro(board_id)
+        (quadro_ativo,) = await DatabaseManager.fetch_one(
+            "SELECT is_active FROM countdown_boards WHERE id = ?", (board_id,)
+        )
+        (ativos,) = await DatabaseManager.fetch_one(
+            "SELECT COUNT(*) FROM countdowns WHERE board_id = ? AND is_active = 1", (board_id,)
+        )
+        retentativa = bot.scheduler._entries[('countdown_board', board_id)][0]
+        depois_da_falha = (quadro_ativo, ativos, list(canal.editados), retentativa)
+
+        relogio.agora = now_epoch()
+        await avancar(bot, relogio, DISPATCH_RETRY_DELAY)
+        return depois_da_falha, canal.editados
+
+    (quadro_ativo, ativos, editados, retentativa), editados_final = asyncio.run(cenario())
+    assert quadro_ativo == 1 and ativos == 3 and editados == []
+    assert retentativa == pytest.approx(now_epoch() + DISPATCH_RETRY_DELAY, abs=2)
+    assert editados_final == [500]
@@ -0,0 +1,183 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from database import DatabaseManager, now_epoch
+from config import DISPATCH_RETRY_DELAY
+from cogs.lembretes import LembretesCog
+from cogs.mensagens_programadas import MensagensProgramadasCog
+from utils.dispatcher import Dispatcher
+from utils.scheduler import Scheduler
+
+class BotFalso:
+    def __init__(self, canal=None):
+        self.scheduler = Scheduler()
+        self.dispatcher = Dispatcher()
+        self.canal = canal
+
+    def get_channel(self, channel_id):
+        return self.canal
+
+class CanalFalso:
+    def __init__(self, falhas=()):
+        self.falhas = list(falhas)   # exceções levantadas pelos próximos envios
+        self.enviadas = []
+
+    async def send(self, content=None, embed=None):
+        if self.falhas:
+            raise self.falhas.pop(0)
+        self.enviadas.append(content)
+
+def erro_http(classe, status):
+    return classe(SimpleNamespace(status=status, reason="erro"), "erro")
+
+def prazo(bot, kind, item_id):
+    entrada = bot.scheduler._entries.get((kind, item_id))
+    return entrada and entrada[0]
+
+async def criar_lembretes(quantidade):
+    for i in range(quantidade):
+        await DatabaseManager.execute_query(
+            "INSERT INTO reminders (user_id, guild_id, channel_id, message, remind_at) VALUES (?, ?, ?, ?, ?)",
+            (1, 1, 1, f"lembrete {i}", now_epoch())
+        )
+
+def test_lembrete_com_envio_falho_volta_ao_agendador(banco):
+    async def cenario():
+        await criar_lembretes(2)
+        bot = BotFalso()
+        cog = LembretesCog(bot)
+
+        async def enviar(lembrete):
+            return lembrete[0] == 1   # o lembrete 2 falha (ex.: HTTP 5xx)
+        cog.enviar_lembrete = enviar
+
+        await cog.disparar_lembretes([1, 2])
+        enviados = await DatabaseManager.fetch_all("SELECT id FROM reminders WHERE is_sent = 1")
+        return bot, enviados
+
+    bot, enviados = asyncio.run(cenario())
+    assert enviados == [(1,)]
+    assert prazo(bot, 'reminder', 1) is None
+    assert prazo(bot, 'reminder', 2) >= now_epoch() + DISPATCH_RETRY_DELAY - 1
+
+def test_falha_na_leitura_reagenda_todos(banco, monkeypatch):
+    async def falhar(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    async def cenario():
+        await criar_lembretes(2)
+        bot = BotFalso()
+        monkeypatch.setattr(DatabaseManager, "fetch_all", falhar)
+        await LembretesCog(bot).disparar_lembretes([1, 2])
+        return bot
+
+    bot = asyncio.run(cenario())
+    assert prazo(bot, 'reminder', 1) and prazo(bot, 'reminder', 2)
+
+def test_lembrete_cancelado_nao_volta(banco):
+    async def cenario():
+        await criar_lembretes(1)
+        await DatabaseManager.execute_query("DELETE FROM reminders WHERE id = 1")
+        bot = BotFalso()
+        await LembretesCog(bot).disparar_lembretes([1])
+        return bot
+
+    bot = asyncio.run(cenario())
+    assert bot.scheduler.pending() == 0
+
+def test_falha_ao_gravar_mantem_repeticao(banco, monkeypatch):
+    async def falhar(*args, **kwargs):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    async def cenario():
+        await DatabaseManager.execute_query(
+            '''INSERT INTO scheduled_messages (guild_id, channel_id, author_id, message, send_at, repeat_interval)
+               VALUES (1, 1, 1, 'bom dia', ?, '1d')''',
+            (now_epoch(),)
+        )
+        bot = BotFalso()
+        cog = MensagensProgramadasCog(bot)
+
+        async def enviar(mensagem):
+            return now_epoch() + 86400
+        cog.enviar_mensagem_programada = enviar
+        monkeypatch.setattr(DatabaseManager, "bulk_update", falhar)
+
+        await cog.disparar_mensagens([1])
+        return bot
+
+    bot = asyncio.run(cenario())
+    assert prazo(bot, 'scheduled_message', 1) == pytest.approx(now_epoch() + DISPATCH_RETRY_DELAY, abs=2)
+
+def test_autocomplete_de_mensagens_exige_gerenciar_mensagens(banco):
+    async def cenario(pode_gerenciar):
+        await DatabaseManager.execute_query(
+            '''INSERT INTO scheduled_messages (guild_id, channel_id, author_id, message, send_at)
+               VALUES (1, 1, 1, 'anúncio secreto', ?)''',
+            (now_epoch() + 3600,)
+        )
+        interacao = SimpleNamespace(
+            guild_id=1,
+            user=SimpleNamespace(guild_permissions=SimpleNamespace(manage_messages=pode_gerenciar))
+        )
+        cog = MensagensProgramadasCog(BotFalso())
+        return await cog.mensagem_autocomplete(interacao, "")
+
+    assert asyncio.run(cenario(False)) == []
+    assert [opcao.value for opcao in asyncio.run(cenario(True))] == [1, 2]
+
+@pytest.mark.parametrize("repeat_interval", [None, '1d'])
+def test_mensagem_com_envio_falho_volta_ao_agendador(banco, repeat_interval):
+    async def cenario():
+        await DatabaseManager.execute_query(
+            '''INSERT INTO scheduled_messages (guild_id, channel_id, author_id, message, send_at, repeat_interval)
+               VALUES (1, 1, 1, 'bom dia', ?, ?)''',
+            (now_epoch(), repeat_interval)
+        )
+        canal = CanalFalso(falhas=[erro_http(discord.HTTPException, 503)])
+        bot = BotFalso(canal)
+        cog = MensagensProgramadasCog(bot)
+
+        await cog.disparar_mensagens([1])
+        depois_da_falha = (
+            await DatabaseManager.fetch_one("SELECT is_sent, send_at FROM scheduled_messages WHERE id = 1"),
+            prazo(bot, 'scheduled_message', 1)
+        )
+
+        # Nova tentativa: desta vez o envio funciona
+        await cog.disparar_mensagens([1])
+        return depois_da_falha, canal.enviadas
+
+    ((is_sent, _), novo_prazo), enviadas = asyncio.run(cenario())
+    assert is_sent == 0
+    assert novo_prazo == pytest.approx(now_epoch() + DISPATCH_RETRY_DELAY, abs=2)
+    assert enviadas == ['bom dia']
+
+def test_mensagem_sem_permissao_nao_e_repetida(banco):
+    async def cenario():
+        await DatabaseManager.execute_query(
+            '''INSERT INTO scheduled_messages (guild_id, channel_id, author_id, message, send_at)
+               VALUES (1, 1, 1, 'bom dia', ?)''',
+            (now_epoch(),)
+        )
+        bot = BotFalso(CanalFalso(falhas=[erro_http(discord.Forbidden, 403)]))
+        await MensagensProgramadasCog(bot).disparar_mensagens([1])
+        return await DatabaseManager.fetch_one("SELECT is_sent FROM scheduled_messages WHERE id = 1"), bot
+
+    (is_sent,), bot = asyncio.run(cenario())
+    assert is_sent == 1 and bot.scheduler.pending() == 0
+
+@pytest.mark.parametrize("classe, kind", [(LembretesCog, 'reminder'), (MensagensProgramadasCog, 'scheduled_message')])
+def test_falha_ao_carregar_pendentes_impede_o_cog(banco, monkeypatch, classe, kind):
+    async def falhar(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(DatabaseManager, "fetch_all", falhar)
+    bot = BotFalso()
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(classe(bot).cog_load())
+    assert kind not in bot.scheduler._handlers
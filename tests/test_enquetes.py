@@ -0,0 +1,119 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from database import DatabaseManager, now_epoch
+from config import DISPATCH_RETRY_DELAY
+from cogs.enquetes import EnquetesCog
+from utils.dispatcher import Dispatcher
+from utils.scheduler import Scheduler
+from utils.helpers import EMBED_FIELD_VALUE_LIMIT, EMBED_TITLE_LIMIT, EMBED_TOTAL_LIMIT, fit_lengths
+
+class BotFalso:
+    def get_user(self, user_id):
+        return None
+
+def embed_enquete(opcoes, votos, titulo="Enquete"):
+    cog = EnquetesCog(BotFalso())
+    enquete = cog.montar_enquete(1, 1, titulo, opcoes, None, 1, autor="Autor")
+    enquete['contagem'] = votos
+    return cog.montar_embed_enquete(enquete)
+
+@pytest.mark.parametrize("tamanho, votos", [(60, 0), (60, 9999), (95, 0), (200, 123456)])
+def test_opcoes_cabem_no_campo(tamanho, votos):
+    opcoes = [f"{i}" * tamanho for i in range(10)]
+    embed = embed_enquete(opcoes, [votos] * 10)
+
+    campo = embed.fields[0].value
+    assert len(campo) <= EMBED_FIELD_VALUE_LIMIT
+    assert len(embed) <= EMBED_TOTAL_LIMIT
+    # Todas as opções continuam com a contagem visível
+    assert campo.count(" votos (") == 10
+
+def test_opcoes_curtas_nao_sao_encurtadas():
+    opcoes = ["Sim", "Não", "Talvez " * 30]
+    campo = embed_enquete(opcoes, [1, 2, 3]).fields[0].value
+    assert "**Sim**" in campo and "**Não**" in campo
+
+def test_titulo_longo_e_encurtado():
+    embed = embed_enquete(["a", "b"], [0, 0], titulo="x" * 1000)
+    assert len(embed.title) <= EMBED_TITLE_LIMIT
+
+def test_fit_lengths():
+    assert fit_lengths([3, 4, 5], 100) is None
+    assert fit_lengths([3, 100, 100], 103) == 50
+    assert fit_lengths([10, 10], 10) == 5
+
+async def falhar(*args, **kwargs):
+    raise sqlite3.OperationalError("database is locked")
+
+def bot_com_agendador():
+    return SimpleNamespace(
+        scheduler=Scheduler(),
+        get_channel=lambda channel_id: None,
+        add_dynamic_items=lambda *itens: None
+    )
+
+def test_leitura_falha_reagenda_enquetes_expiradas(banco, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "fetch_all", falhar)
+    bot = bot_com_agendador()
+    antes = now_epoch()
+
+    asyncio.run(EnquetesCog(bot).encerrar_enquetes_expiradas([1, 2]))
+
+    for poll_id in (1, 2):
+        assert bot.scheduler._entries[('poll', poll_id)][0] >= antes + DISPATCH_RETRY_DELAY
+
+def test_falha_ao_carregar_enquetes_impede_o_cog(banco, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "fetch_all", falhar)
+    bot = bot_com_agendador()
+
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(EnquetesCog(bot).cog_load())
+    assert 'poll' not in bot.scheduler._handlers
+
+class MensagemFalsa:
+    def __init__(self, falhas):
+        self.falhas = falhas   # exceção levantada por message_id
+        self.editadas = []
+
+    def get_partial_message(self, message_id):
+        mensagem = self
+
+        class Parcial:
+            async def edit(self, embed=None):
+                if message_id in mensagem.falhas:
+                    raise mensagem.falhas.pop(message_id)
+                mensagem.editadas.append(message_id)
+        return Parcial()
+
+def erro_http(classe, status):
+    return classe(SimpleNamespace(status=status, reason="erro"), "erro")
+
+def test_edicao_falha_volta_para_a_proxima_rodada():
+    mensagens = MensagemFalsa({
+        10: erro_http(discord.HTTPException, 503),
+        20: erro_http(discord.NotFound, 404)
+    })
+    bot = SimpleNamespace(
+        dispatcher=Dispatcher(),
+        get_user=lambda user_id: None,
+        get_partial_messageable=lambda channel_id: mensagens
+    )
+    cog = EnquetesCog(bot)
+    for message_id in (10, 20, 30):
+        enquete = cog.montar_enquete(message_id, 1, "Enquete", ["a", "b"], None, 1)
+        cog.indexar_enquete(message_id, enquete)
+        cog.registrar_voto(enquete, 1, 0)   # marca a enquete como alterada
+
+    asyncio.run(cog.atualizar_mensagens.coro(cog))
+    assert mensagens.editadas == [30]
+    # 503 é repetida na próxima rodada; mensagem apagada não
+    assert list(cog.enquetes_alteradas) == [10]
+
+    asyncio.run(cog.atualizar_mensagens.coro(cog))
+    assert mensagens.editadas == [30, 10]
+    assert cog.enquetes_alteradas == {}
@@ -0,0 +1,83 @@
+import asyncio
+import re
+import sqlite3
+
+import pytest
+
+import database
+from database import MIGRATIONS
+
+# (consulta dos cogs, parâmetros, índices aceitos no plano); as cargas completas
+# (ex.: is_sent = 0) podem ler qualquer índice parcial com o mesmo filtro
+PENDENTES_LEMBRETES = ("idx_reminders_due", "idx_reminders_user_pending")
+PENDENTES_MENSAGENS = ("idx_scheduled_due", "idx_scheduled_guild_pending")
+
+CONSULTAS = [
+    # Carga do agendador (lembretes.cog_load / mensagens_programadas.cog_load)
+    ("SELECT id, remind_at FROM reminders WHERE is_sent = 0", (), PENDENTES_LEMBRETES),
+    ("SELECT id, send_at FROM scheduled_messages WHERE is_sent = 0", (), PENDENTES_MENSAGENS),
+    # Vencidos por prazo (remind_at/send_at <= agora)
+    ("SELECT id FROM reminders WHERE remind_at <= ? AND is_sent = 0", (0,), "idx_reminders_due"),
+    ("SELECT id FROM scheduled_messages WHERE send_at <= ? AND is_sent = 0", (0,), "idx_scheduled_due"),
+    # meus_lembretes
+    ('''SELECT id, message, remind_at FROM reminders
+        WHERE user_id = ? AND guild_id = ? AND is_sent = 0
+        ORDER BY remind_at ASC''', (1, 1), "idx_reminders_user_pending"),
+    # mensagens_agendadas
+    ('''SELECT id, channel_id, author_id, message, send_at, repeat_interval
+        FROM scheduled_messages
+        WHERE guild_id = ? AND is_sent = 0
+        ORDER BY send_at ASC''', (1,), "idx_scheduled_guild_pending"),
+    # Reações e resultados das enquetes
+    ("SELECT id, options FROM polls WHERE message_id = ? AND is_active = 1", (1,), "idx_polls_message"),
+    ("SELECT id, title, options FROM polls WHERE message_id = ?", (1,), "idx_polls_message"),
+    # Carga das enquetes com prazo
+    ('''SELECT id, expires_at FROM polls
+        WHERE is_active = 1 AND expires_at IS NOT NULL''', (), "idx_polls_expiring"),
+    # reconstruir_apuracoes: votos só das enquetes ativas
+    ('''SELECT poll_id, user_id, option_index FROM poll_votes
+        WHERE poll_id IN (SELECT id FROM polls WHERE is_active = 1)''', (), "sqlite_autoindex_poll_votes_1"),
+    # Limite de tarefas (contador mantido por triggers)
+    ('''SELECT active_count FROM task_counters
+        WHERE user_id = ? AND guild_id = ?''', (1, 1), "USING PRIMARY KEY"),
+    # contar_tarefas
+    ('''SELECT COUNT(*) FROM tasks
+        WHERE user_id = ? AND guild_id = ? AND is_completed = ?''', (1, 1, 0), "idx_tasks_user_page"),
+    # meus_contadores
+    ('''SELECT id, title, target_date FROM countdowns
+        WHERE author_id = ? AND guild_id = ? AND is_active = 1
+        ORDER BY target_date ASC''', (1, 1), "idx_countdowns_author_active"),
+    # Carga dos contadores ativos
+    ("SELECT id, target_date, board_id FROM countdowns WHERE is_active = 1", (),
+     ("idx_countdowns_active", "idx_countdowns_board")),
+    # atualizar_quadro
+    ('''SELECT title, target_date FROM countdowns
+        WHERE board_id = ? AND is_active = 1 AND target_date > ?
+        ORDER BY target_date ASC''', (1, 0), "idx_countdowns_board"),
+    ("SELECT id FROM countdown_boards WHERE channel_id = ? AND is_active = 1", (1,), "idx_countdown_boards_channel"),
+]
+
+def plano(caminho, consulta, parametros):
+    with sqlite3.connect(caminho) as db:
+        return " | ".join(linha[-1] for linha in db.execute(f"EXPLAIN QUERY PLAN {consulta}", parametros))
+
+@pytest.mark.parametrize("consulta, parametros, indices", CONSULTAS)
+def test_consultas_usam_indice(banco, consulta, parametros, indices):
+    if isinstance(indices, str):
+        indices = (indices,)
+    detalhes = plano(banco, consulta, parametros)
+    assert any(indice in detalhes for indice in indices), detalhes
+    # Nenhuma leitura da tabela inteira
+    assert not re.search(r"SCAN \w+( \||$)", detalhes), detalhes
+
+def test_todas_as_migracoes_registradas(banco):
+    with sqlite3.connect(banco) as db:
+        versoes = [versao for (versao,) in db.execute("SELECT version FROM schema_version ORDER BY version")]
+    assert versoes == [versao for versao, _, _ in MIGRATIONS]
+
+def test_migracoes_idempotentes(banco):
+    # Rodar de novo não reaplica nenhuma migração
+    asyncio.run(database.init_database())
+    with sqlite3.connect(banco) as db:
+        (total,) = db.execute("SELECT COUNT(*) FROM schema_version").fetchone()
+    assert total == len(MIGRATIONS)
@@ -0,0 +1,72 @@
+import asyncio
+import random
+import re
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from cogs.tarefas import TarefasCog, TAREFAS_POR_PAGINA
+from database import DatabaseManager
+
+FILTROS = [
+    ("pending", None), ("completed", None), ("all", None),
+    ("pending", 2), ("completed", 2), ("all", 2),
+]
+
+async def criar_tarefas(quantidade, semente=1):
+    aleatorio = random.Random(semente)
+    linhas = [
+        (1, 1, f"tarefa {i}", aleatorio.choice([1, 2, 3]),
+         aleatorio.choice([None, aleatorio.randint(1, 50) * 86400]), aleatorio.random() < 0.5)
+        for i in range(quantidade)
+    ]
+    await DatabaseManager.execute_transaction([(
+        "INSERT INTO tasks (user_id, guild_id, title, priority, due_date, is_completed) VALUES (?, ?, ?, ?, ?, ?)",
+        linhas,
+        True
+    )])
+
+async def todas_as_paginas(cog, status, prioridade):
+    ids, cursor = [], None
+    while True:
+        pagina, cursor = await cog.buscar_pagina(1, 1, status, prioridade, cursor=cursor)
+        assert len(pagina) <= TAREFAS_POR_PAGINA
+        ids += [tarefa[0] for tarefa in pagina]
+        if cursor is None:
+            return ids
+
+@pytest.mark.parametrize("status, prioridade", FILTROS)
+def test_paginas_seguem_a_ordem_completa(banco, status, prioridade):
+    async def cenario():
+        await criar_tarefas(137)
+        where, params = TarefasCog(SimpleNamespace()).filtro_tarefas(1, 1, status, prioridade)
+        esperado = await DatabaseManager.fetch_all(
+            f'''SELECT id FROM tasks WHERE {where}
+                ORDER BY priority ASC, due_date ASC, created_at DESC, id DESC''',
+            params
+        )
+        return [task_id for (task_id,) in esperado], await todas_as_paginas(TarefasCog(SimpleNamespace()), status, prioridade)
+
+    esperado, paginado = asyncio.run(cenario())
+    assert paginado == esperado
+
+@pytest.mark.parametrize("status, prioridade", FILTROS)
+def test_cursor_usa_busca_no_indice(banco, monkeypatch, status, prioridade):
+    consultas = []
+
+    async def capturar(query, params=None, **kwargs):
+        consultas.append((query, params))
+        return []
+
+    monkeypatch.setattr(DatabaseManager, "fetch_all", capturar)
+    asyncio.run(TarefasCog(SimpleNamespace()).buscar_pagina(1, 1, status, prioridade, cursor=(2, 0, -5)))
+    query, params = consultas[0]
+
+    with sqlite3.connect(banco) as db:
+        plano = " | ".join(linha[-1] for linha in db.execute(f"EXPLAIN QUERY PLAN {query}", params))
+
+    # O cursor vira limite da busca no índice, sem ordenação temporária
+    assert re.search(r"SEARCH tasks USING INDEX idx_tasks_user_page(_all)? \(.*\(.*recency_key\)>", plano), plano
+    assert "TEMP B-TREE" not in plano, plano
+    assert "priority>=" not in plano.replace(" ", ""), plano
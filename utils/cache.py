@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from discord import app_commands
+from config import AUTOCOMPLETE_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# Limite de opções do autocomplete imposto pelo Discord
+MAX_CHOICES = 25
+
+class AutocompleteCache:
+    """
+    Cache em memória, por chave (ex.: usuário e servidor), dos itens oferecidos no autocomplete.
+    Cada chave é carregada do banco no máximo uma vez por TTL e as digitações seguintes
+    só filtram a lista em memória. Escritas devem chamar invalidate() na chave afetada.
+    """
+
+    def __init__(self, loader, ttl=AUTOCOMPLETE_CACHE_TTL, clock=time.monotonic):
+        self.loader = loader      # coroutine(chave) -> lista de (id, rótulo, extra)
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = {}        # chave -> (expira em, itens normalizados)
+        self._loading = {}        # chave -> future da carga em andamento
+        self._generations = {}    # chave -> número de invalidações
+
+    async def get(self, key):
+        """Itens da chave, carregando do banco se não estiverem em cache"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self.clock():
+            return entry[1]
+
+        # Digitações simultâneas da mesma chave aguardam uma única carga
+        future = self._loading.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        generation = self._generations.get(key, 0)
+        future = asyncio.ensure_future(self._load(key))
+        self._loading[key] = future
+        try:
+            itens = await asyncio.shield(future)
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+
+        # Uma invalidação durante a carga descarta o resultado (pode estar desatualizado)
+        if self._generations.get(key, 0) == generation:
+            self._prune()
+            self._entries[key] = (self.clock() + self.ttl, itens)
+        return itens
+
+    async def _load(self, key):
+        return [
+            (item_id, rotulo, extra, rotulo.lower(), rotulo.lower().split())
+            for item_id, rotulo, extra in await self.loader(key)
+        ]
+
+    def invalidate(self, key):
+        """Descarta a chave após uma escrita que altere seus itens"""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._entries.pop(key, None)
+        self._loading.pop(key, None)
+
+    def _prune(self):
+        agora = self.clock()
+        for key in [key for key, (expira, _) in self._entries.items() if expira <= agora]:
+            del self._entries[key]
+
+    async def choices(self, key, current, predicate=None):
+        """Opções do autocomplete cujo ID ou alguma palavra do rótulo começa com o texto digitado"""
+        termo = current.strip().lower()
+        opcoes = []
+
+        for item_id, rotulo, extra, rotulo_lower, palavras in await self.get(key):
+            if predicate is not None and not predicate(extra):
+                continue
+
+            if termo and not (
+                str(item_id).startswith(termo)
+                or rotulo_lower.startswith(termo)
+                or any(palavra.startswith(termo) for palavra in palavras)
+            ):
+                continue
+
+            opcoes.append(app_commands.Choice(name=f"#{item_id} · {rotulo}"[:100], value=item_id))
+            if len(opcoes) == MAX_CHOICES:
+                break
+
+        return opcoes
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+import weakref
+from config import DISPATCH_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+def percentile(sorted_values, fraction):
+    """Percentil por posição mais próxima de uma lista já ordenada"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Dispatcher:
+    """
+    Envia itens vencidos em paralelo com um limite global de concorrência.
+    Os itens de um mesmo canal são enviados um de cada vez, na ordem do prazo,
+    o que preserva a ordem no canal e respeita o bucket de rate limit por canal do Discord.
+    """
+
+    def __init__(self, concurrency=DISPATCH_CONCURRENCY):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._channel_locks = weakref.WeakValueDictionary()
+
+    def _channel_lock(self, channel_id):
+        lock = self._channel_locks.get(channel_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._channel_locks[channel_id] = lock
+        return lock
+
+    async def dispatch(self, items, send, channel_of, due_of, label="itens"):
+        """
+        Envia `items` chamando `send(item)` e retorna os resultados na ordem de entrada
+        (a exceção levantada por um envio é retornada no lugar do seu resultado).
+        """
+        if not items:
+            return []
+
+        # Agrupar por canal mantendo a ordem do prazo dentro de cada canal
+        ordem = sorted(range(len(items)), key=lambda i: due_of(items[i]))
+        por_canal = {}
+        for i in ordem:
+            por_canal.setdefault(channel_of(items[i]), []).append(i)
+
+        resultados = [None] * len(items)
+        latencias = []
+
+        async def enviar_canal(channel_id, indices):
+            async with self._channel_lock(channel_id):
+                for i in indices:
+                    async with self._semaphore:
+                        try:
+                            resultados[i] = await send(items[i])
+                        except Exception as e:
+                            logger.error(f"Erro ao enviar {label} no canal {channel_id}: {e}")
+                            resultados[i] = e
+                    latencias.append(time.time() - due_of(items[i]))
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(enviar_canal(canal, indices) for canal, indices in por_canal.items()))
+        duracao = time.perf_counter() - inicio
+
+        latencias.sort()
+        logger.info(
+            f"{len(items)} {label} enviados em {duracao:.2f}s "
+            f"({len(por_canal)} canal(is)) - atraso p50={percentile(latencias, 0.50):.2f}s "
+            f"p95={percentile(latencias, 0.95):.2f}s p99={percentile(latencias, 0.99):.2f}s"
+        )
+
+        return resultados
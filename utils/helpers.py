@@ -3,12 +3,20 @@ import re
 import discord
 from config import EMOJIS
 
+# Limites de tamanho dos embeds impostos pelo Discord (acima deles o envio falha com HTTP 400)
+EMBED_TITLE_LIMIT = 256
+EMBED_FIELD_NAME_LIMIT = 256
+EMBED_FIELD_VALUE_LIMIT = 1024
+EMBED_TOTAL_LIMIT = 6000
+
 def format_datetime(dt):
     """Formata datetime para exibição amigável"""
     if not dt:
         return "Não definido"
     
-    if isinstance(dt, str):
+    if isinstance(dt, int):
+        dt = datetime.fromtimestamp(dt)
+    elif isinstance(dt, str):
         dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
     
     return dt.strftime("%d/%m/%Y às %H:%M")
@@ -39,6 +47,33 @@ def parse_duration(duration_str):
     
     return None
 
+def parse_id_list(ids_str, max_items=100):
+    """
+    Converte uma lista de IDs em texto em uma lista ordenada de inteiros
+    Formatos aceitos: 3,5,8-12 (vírgulas ou espaços, intervalos com hífen)
+    Retorna None se o texto for inválido ou tiver mais de max_items IDs
+    """
+    ids = set()
+    
+    for parte in re.split(r'[,\s]+', ids_str.strip()):
+        if not parte:
+            continue
+        
+        match = re.fullmatch(r'(\d+)(?:-(\d+))?', parte)
+        if not match:
+            return None
+        
+        inicio = int(match.group(1))
+        fim = int(match.group(2) or inicio)
+        if fim < inicio or fim - inicio >= max_items:
+            return None
+        
+        ids.update(range(inicio, fim + 1))
+        if len(ids) > max_items:
+            return None
+    
+    return sorted(ids) or None
+
 def format_duration(td):
     """Formata timedelta em texto legível"""
     if not td:
@@ -79,6 +114,20 @@ def truncate_text(text, max_length=100):
     
     return text[:max_length-3] + "..."
 
+def fit_lengths(lengths, budget):
+    """
+    Maior tamanho máximo por item para que a soma dos tamanhos (já truncados) caiba em `budget`:
+    itens curtos ficam inteiros e o espaço que sobra é dividido entre os longos.
+    Retorna None se todos cabem sem truncar.
+    """
+    remaining = len(lengths)
+    for length in sorted(lengths):
+        if length * remaining > budget:
+            return max(0, budget // remaining)
+        budget -= length
+        remaining -= 1
+    return None
+
 def create_embed_template(title, description=None, color=None):
     """Cria um embed base com formatação padrão"""
     embed = discord.Embed(
@@ -0,0 +1,137 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Intervalo máximo de sono: protege contra ajustes do relógio do sistema
+MAX_SLEEP = 60
+
+class Scheduler:
+    """
+    Agendador em memória baseado em min-heap.
+    Dorme até o próximo prazo e entrega os itens vencidos ao handler do seu tipo,
+    sem consultar o banco de dados enquanto não houver nada a disparar.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._heap = []       # (prazo, seq, tipo, item_id)
+        self._entries = {}    # (tipo, item_id) -> (prazo, seq)
+        self._handlers = {}   # tipo -> coroutine que recebe a lista de ids vencidos
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._running = set()
+        self._task = None
+
+    def register(self, kind, handler):
+        """Registra o handler chamado com os ids vencidos de um tipo"""
+        self._handlers[kind] = handler
+
+    def unregister(self, kind):
+        """Remove o handler e todos os itens pendentes de um tipo"""
+        self._handlers.pop(kind, None)
+        for key in [key for key in self._entries if key[0] == kind]:
+            del self._entries[key]
+
+    def schedule(self, kind, item_id, due):
+        """Agenda (ou reagenda) um item para o instante `due` (segundos desde a época)"""
+        seq = next(self._counter)
+        self._entries[(kind, item_id)] = (due, seq)
+
+        wake = not self._heap or due < self._heap[0][0]
+        heapq.heappush(self._heap, (due, seq, kind, item_id))
+
+        # Só é preciso acordar o loop se o novo item vence antes do atual
+        if wake:
+            self._wakeup.set()
+
+    def cancel(self, kind, item_id):
+        """Cancela um item agendado (a entrada no heap é descartada ao ser alcançada)"""
+        return self._entries.pop((kind, item_id), None) is not None
+
+    def pending(self, kind=None):
+        """Quantidade de itens agendados"""
+        if kind is None:
+            return len(self._entries)
+        return sum(1 for key in self._entries if key[0] == kind)
+
+    def start(self, wait_ready=None):
+        """Inicia o loop do agendador, opcionalmente aguardando o bot ficar pronto"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(wait_ready), name="scheduler")
+
+    async def stop(self):
+        """Encerra o loop e os disparos em andamento"""
+        tasks = list(self._running)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _is_current(self, due, seq, kind, item_id):
+        return self._entries.get((kind, item_id)) == (due, seq)
+
+    def _next_due(self):
+        """Prazo do próximo item válido, descartando entradas canceladas ou reagendadas"""
+        while self._heap:
+            due, seq, kind, item_id = self._heap[0]
+            if self._is_current(due, seq, kind, item_id):
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now=None):
+        """Remove e retorna os itens vencidos agrupados por tipo"""
+        now = self.clock() if now is None else now
+        vencidos = {}
+
+        while self._heap and self._heap[0][0] <= now:
+            due, seq, kind, item_id = heapq.heappop(self._heap)
+            if not self._is_current(due, seq, kind, item_id):
+                continue
+            del self._entries[(kind, item_id)]
+            vencidos.setdefault(kind, []).append(item_id)
+
+        return vencidos
+
+    async def _run(self, wait_ready):
+        if wait_ready is not None:
+            await wait_ready()
+
+        while True:
+            self._wakeup.clear()
+
+            for kind, item_ids in self.pop_due().items():
+                self._dispatch(kind, item_ids)
+
+            next_due = self._next_due()
+            timeout = MAX_SLEEP if next_due is None else min(MAX_SLEEP, next_due - self.clock())
+
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _dispatch(self, kind, item_ids):
+        """Entrega os itens ao handler em uma task separada, sem bloquear o loop"""
+        handler = self._handlers.get(kind)
+        if handler is None:
+            logger.warning(f"Nenhum handler registrado para itens do tipo '{kind}'")
+            return
+
+        task = asyncio.create_task(self._call(kind, handler, item_ids))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _call(self, kind, handler, item_ids):
+        try:
+            await handler(item_ids)
+        except Exception as e:
+            logger.error(f"Erro ao disparar itens do tipo '{kind}': {e}")